@@ -50,3 +50,18 @@ display(HTML(html))
 # - With `connected=True` you get an autonomous HTML fragment that loads `dt_for_itables` from the Internet
 # - With `connected=False`, the HTML snippet works only after you add the output of `generate_init_offline_itables_html()` to your HTML document
 # ~~~
+#
+# ## Serving large tables
+#
+# A large table makes a large HTML file, because its rows are embedded in it. Alternatively, you can serve the table with `itables.server.serve`. This starts a small HTTP server in a background thread. The server implements the DataTables [server-side protocol](https://datatables.net/manual/server-side): the table is filtered, sorted and paged in Python, and only the displayed rows are sent to the browser.
+#
+# ```python
+# from itables.server import serve
+#
+# server = serve(df, port=8765, allow_origin="http://localhost:8888")
+# html = server.to_html_datatable()
+# ```
+#
+# The HTML returned by `server.to_html_datatable()` contains the table header, but no row. DataTables requests the rows from `server.url`, which you can also pass to `to_html_datatable` with the `server_side_url` option. The table is available for as long as the server runs. Call `server.shutdown()` to stop it. By default, the server listens on `127.0.0.1` only.
+#
+# Since the table and the server have different origins, the browser only lets the table query the server if you pass the origin of the page that displays it in `allow_origin`. Use e.g. `http://localhost:8888` in Jupyter, or `null` for a local HTML file. Don't use `allow_origin="*"`, which lets any web page open in your browser read the full table.
@@ -94,6 +94,29 @@ table.caption = "numbers and strings"
 table.update(df.head(20), selected_rows=[7, 8])
 
 # %% [markdown]
+# ## Server-side processing
+#
+# By default, the table data is sent to the browser, and large tables are [downsampled](../downsampling.md).
+# With `server_side=True`, the widget sends no rows at all. Instead, DataTables runs in [server-side](https://datatables.net/manual/server-side) mode. Each time you change the page, the order or the search, it requests the rows it needs from Python. The full table is filtered and sorted in Python, and only the requested page is formatted and sent back:
+#
+# ```python
+# import numpy as np
+# import pandas as pd
+#
+# from itables.widget import ITable
+#
+# df = pd.DataFrame(np.random.default_rng(0).normal(size=(10_000_000, 5)))
+# ITable(df, server_side=True)
+# ```
+#
+# The server-side mode is available for Pandas and Polars DataFrames, and, with `server_side_engine="duckdb"`, for the other DataFrames that [DuckDB](https://duckdb.org) can read (e.g. PyArrow tables). The search is a case-insensitive substring search, on the string representation of the values. Row selection is not available in this mode.
+#
+# By default the table is filtered and sorted with Pandas or Polars. With `server_side_engine="duckdb"`, the DataFrame is registered in DuckDB without a copy, and each request is translated to a SQL query with `LIMIT` and `OFFSET`. DuckDB runs the queries on several threads, which is faster on large tables. Like with Pandas and Polars, the rows that have equal values in the sorted columns come in the DataFrame order.
+#
+# With the default engine and a Pandas or Polars DataFrame, the first global search builds a search index: the text of each row, in lower case. The following searches are then one substring search per search term on that index, rather than one per term and per column. The index is kept when you update only the options of the widget, and rebuilt when you pass a DataFrame to `update`, even the same one (e.g. after an in-place change).
+#
+# Polars LazyFrames, e.g. `pl.scan_parquet(...)`, are not collected in server-side mode. Each request becomes a query plan (a `filter` on the search terms, a `sort` on the requested columns, and a `slice`), and only the requested page is collected. Polars can then push the filter down to the scan, and run the sort and the slice as a top-k query.
+#
 # ## Using HTML
 #
 # An alternative to the widget, if you only want to _display_ the table, is the `show` function. Below is an example in which we use `show` to display a different table depending on the value of a drop-down component:
@@ -36,6 +36,21 @@ function parseJSON(jsonString) {
     });
 }
 
+async function decompressJSON(data_json) {
+    // data_json_compression="gzip": data_json is gzip-compressed and base64-encoded,
+    // or directly a binary buffer (e.g. in the anywidget)
+    const bytes = (typeof data_json === 'string') ? Uint8Array.from(atob(data_json), c => c.charCodeAt(0)) : data_json;
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+    return parseJSON(await new Response(stream).text());
+}
+
+function columnsToRows(columns) {
+    // data_json_orient="columns": data_json holds one array per column
+    if (columns.length === 0)
+        return [];
+    return columns[0].map((_, i) => columns.map(column => column[i]));
+}
+
 // The global eval in evalNestedKeys might need jQuery
 window.$ = jQuery;
 
@@ -69,12 +84,26 @@ function evalNestedKeys(obj, keys, context) {
 
 class ITable {
     constructor(table, itable_args) {
-        const { data, caption, classes, style, data_json, table_html, table_style, selected_rows, filtered_row_count, filtered_column_count, keys_to_be_evaluated, column_filters, text_in_header_can_be_selected, initComplete, downsampling_warning, ...dt_args } = itable_args;
+        const { data, caption, classes, style, data_json, data_json_orient, data_json_compression, server_side_url, table_html, table_style, selected_rows, filtered_row_count, filtered_column_count, keys_to_be_evaluated, column_filters, text_in_header_can_be_selected, initComplete, downsampling_warning, ...dt_args } = itable_args;
         if (data !== undefined) {
             throw new Error("The 'data' property is not allowed in dt_args.");
         }
-        if (data_json) {
+        if (data_json && data_json_compression === "gzip") {
+            // DecompressionStream is asynchronous: the table is created empty,
+            // and the rows are added once they are decompressed
+            dt_args.data = [];
+        }
+        else if (data_json) {
             dt_args.data = parseJSON(data_json);
+            if (data_json_orient === "columns") {
+                dt_args.data = columnsToRows(dt_args.data);
+            }
+        }
+        if (server_side_url) {
+            // The pages are requested from an itables.server, and parsed
+            // like data_json (non-finite floats, large integers)
+            dt_args.serverSide = true;
+            dt_args.ajax = { url: server_side_url, converters: { "text json": parseJSON } };
         }
         if (keys_to_be_evaluated) {
             keys_to_be_evaluated.forEach(keys => evalNestedKeys(dt_args, keys, keys.join('.')));
@@ -177,6 +206,32 @@ class ITable {
         if (caption !== undefined) {
             this.dt.caption(caption);
         }
+        if (data_json && data_json_compression === "gzip") {
+            this.data_loaded = decompressJSON(data_json).then(data => {
+                this.data_loaded = null;
+                if (!this.dt) {
+                    // The table was destroyed before the data was decompressed
+                    return;
+                }
+                if (data_json_orient === "columns") {
+                    data = columnsToRows(data);
+                }
+                this.dt.rows.add(data).draw();
+                if (this.pending_selected_rows !== undefined) {
+                    this.selected_rows = this.pending_selected_rows;
+                    delete this.pending_selected_rows;
+                }
+            }).catch(error => {
+                // e.g. a corrupt payload, or a browser without DecompressionStream
+                this.data_loaded = null;
+                delete this.pending_selected_rows;
+                console.error(`Error loading the table data: ${error}`);
+                if (this.dt) {
+                    this.dt.settings()[0].oLanguage.sEmptyTable = `Error loading the table data: ${error}`;
+                    this.dt.draw();
+                }
+            });
+        }
         if (selected_rows !== undefined) {
             this.selected_rows = selected_rows;
         }
@@ -191,6 +246,11 @@ class ITable {
     }
 
     set selected_rows(selected_rows) {
+        if (this.data_loaded) {
+            // The rows are selected once the data is decompressed
+            this.pending_selected_rows = selected_rows;
+            return;
+        }
         let data_row_count = this.dt.rows().count();
         let bottom_half = data_row_count / 2;
         let top_half = bottom_half + this.filtered_row_count;
@@ -202,6 +262,9 @@ class ITable {
     }
 
     get selected_rows() {
+        if (this.data_loaded) {
+            return Array.from(this.pending_selected_rows || []);
+        }
         // Here the selected rows are for the datatable.
         // We convert them back to the full table
         let data_row_count = this.dt.rows().count();
@@ -301,6 +364,6 @@ function set_or_remove_dark_class() {
     }
 }
 
-export { ITable, DateTime, jQuery, set_or_remove_dark_class };
+export { ITable, DateTime, jQuery, parseJSON, set_or_remove_dark_class };
 
 export default DataTable;
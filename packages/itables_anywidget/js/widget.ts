@@ -1,9 +1,11 @@
 import type { RenderContext } from "@anywidget/types";
-import { ITable, set_or_remove_dark_class } from 'dt_for_itables';
+import { ITable, parseJSON, set_or_remove_dark_class } from 'dt_for_itables';
 
 /* Specifies attributes defined with traitlets in ../src/itables_anywidget/__init__.py */
 interface WidgetModel {
 	_dt_args: object;
+	_data_json: DataView;
+	_server_side: boolean;
 	caption: string;
 	classes: string;
 	_style: string;
@@ -45,8 +47,36 @@ function render({ model, el }: RenderContext<WidgetModel>) {
 	// from within 'create_table'
 	let dt = null;
 
+	// In server-side mode, DataTables requests the rows one page at a time,
+	// and the Python side answers with a custom message
+	let server_side_callbacks = new Map<number, Function>();
+	let server_side_request_id = 0;
+	function request_page(data: any, callback: Function) {
+		server_side_request_id += 1;
+		server_side_callbacks.set(server_side_request_id, callback);
+		model.send({ type: "server_side_request", id: server_side_request_id, request: data });
+	}
+	model.on("msg:custom", (msg: any) => {
+		if (msg.type === "server_side_reload") {
+			if (dt)
+				dt.dt.ajax.reload(null, false);
+			return;
+		}
+		if (msg.type !== "server_side_response")
+			return;
+		let callback = server_side_callbacks.get(msg.id);
+		if (!callback)
+			return;
+		server_side_callbacks.delete(msg.id);
+		const { id, type, data_json, ...response } = msg;
+		callback({ ...response, data: data_json ? parseJSON(data_json) : [] });
+	});
+
 	let setting_selected_rows_from_model = false;
 	function set_selected_rows_from_model() {
+		// Row selection is not available in server-side mode
+		if (model.get('_server_side'))
+			return;
 		// We use this variable to avoid triggering model updates!
 		setting_selected_rows_from_model = true;
 		dt.selected_rows = model.get('selected_rows');
@@ -58,20 +88,40 @@ function render({ model, el }: RenderContext<WidgetModel>) {
 			dt.destroy();
 		}
 
-		let dt_args = model.get('_dt_args');
+		let dt_args: any = { ...model.get('_dt_args') };
+		// The table data is sent as a binary buffer, cf. _pop_data_json
+		let data_json = model.get('_data_json');
+		if (data_json && data_json.byteLength) {
+			dt_args.data_json = (dt_args.data_json_compression === "gzip") ? data_json : new TextDecoder().decode(data_json);
+		}
+		if (model.get('_server_side')) {
+			dt_args.serverSide = true;
+			dt_args.ajax = (data: any, callback: Function, settings: any) => request_page(data, callback);
+		}
 		dt = new ITable(table, dt_args);
 		set_selected_rows_from_model();
 	}
 	update_table();
 
-	model.on('change:_dt_args', () => {
-		update_table();
-	});
+	// _dt_args and _data_json are often updated together,
+	// in which case we re-create the table only once
+	let table_update_pending = false;
+	function schedule_table_update() {
+		if (table_update_pending)
+			return;
+		table_update_pending = true;
+		queueMicrotask(() => {
+			table_update_pending = false;
+			update_table();
+		});
+	}
+	model.on('change:_dt_args', schedule_table_update);
+	model.on('change:_data_json', schedule_table_update);
 
 	model.on("change:selected_rows", set_selected_rows_from_model);
 
 	function export_selected_rows() {
-		if (setting_selected_rows_from_model)
+		if (setting_selected_rows_from_model || model.get('_server_side'))
 			return;
 
 		model.set('selected_rows', dt.selected_rows);
@@ -6,6 +6,7 @@ from .javascript import (
     to_html_datatable,
     to_html_static_preview,
     to_markdown_table,
+    write_html_datatable,
 )
 from .typing import (
     DataFrameOrSeries,
@@ -31,6 +32,7 @@ __all__ = [
     "to_html_datatable",
     "to_html_static_preview",
     "to_markdown_table",
+    "write_html_datatable",
     "show",
     "init_notebook_mode",
     "JavascriptCode",
@@ -1,9 +1,14 @@
 import json
 import math
 import os
+import re
 import sys
 import warnings
-from typing import Any, Optional, Sequence
+import zlib
+from base64 import b64decode, b64encode
+from itertools import chain, compress, count, islice, repeat
+from operator import is_
+from typing import Any, Iterable, Iterator, Literal, Optional, Sequence, Union
 
 from .typing import DataFrameOrSeries, get_dataframe_module_name
 
@@ -17,32 +22,47 @@ def _format_pandas_series(
 
     if dtype_kind == "f" and not format_floats_in_python:
         # Return floats as-is
-        return [escape_non_finite_float(v) for v in x._values]
+        return escape_non_finite_floats(x._values)
 
     if dtype_kind == "s":
         if escape_html:
             return x
-        return [escape_html_chars(i) for i in x]
+        return escape_html_chars_in_column(x)
 
-    import pandas.io.formats.format as fmt
+    if dtype_kind == "f" and isinstance(x._values, sys.modules["numpy"].ndarray):
+        formatted = format_float_values(x._values)
+        if formatted is not None:
+            if escape_html:
+                formatted = escape_html_chars_in_column(formatted)
+            return [
+                [formatted_value, value]
+                for formatted_value, value in zip(
+                    formatted, escape_non_finite_floats(x._values)
+                )
+            ]
 
-    try:
-        formatted = fmt.format_array(x._values, None, justify="all", leading_space=False)  # type: ignore
-    except TypeError:
-        # Older versions of Pandas don't have 'leading_space'
-        formatted = fmt.format_array(x._values, None, justify="all")  # type: ignore
+    pd = sys.modules["pandas"]
+    if (
+        isinstance(x.dtype, pd.CategoricalDtype)
+        and not add_rank_to_categories
+        and x.cat.categories.inferred_type == "string"
+    ):
+        return _format_pandas_string_categorical(x, escape_html)
+
+    formatted = _pandas_format_array(x._values)
 
     if escape_html:
-        formatted = [escape_html_chars(i) for i in formatted]
+        formatted = escape_html_chars_in_column(formatted)
 
     if dtype_kind == "f":
         return [
-            [formatted_value, escape_non_finite_float(value)]
-            for formatted_value, value in zip(formatted, x._values)
+            [formatted_value, value]
+            for formatted_value, value in zip(
+                formatted, escape_non_finite_floats(x._values)
+            )
         ]
 
     if add_rank_to_categories:
-        pd = sys.modules["pandas"]
         if isinstance(x.dtype, pd.CategoricalDtype):
             codes = x.cat.codes.tolist()
             # null (code=-1) gets rank 0 (sorts first), categories are 1-indexed
@@ -51,6 +71,77 @@ def _format_pandas_series(
     return formatted
 
 
+def format_float_values(values) -> "Optional[list[str]]":
+    """Format a NumPy array of floats like Pandas does when it displays a column,
+    i.e. with 'display.precision' digits and the trailing zeros trimmed equally
+    over the column, or in scientific notation when some values are too small
+    or too large. Returns None when the Pandas display options require a custom
+    formatting ('display.float_format' or 'display.chop_threshold'), and for
+    other dtypes than float64, which Pandas formats in their own precision."""
+    np = sys.modules["numpy"]
+    pd = sys.modules["pandas"]
+    values = np.asarray(values)
+    if (
+        values.dtype != np.float64
+        or pd.get_option("display.float_format") is not None
+        or pd.get_option("display.chop_threshold") is not None
+    ):
+        return None
+
+    digits = pd.get_option("display.precision")
+    is_nan = np.isnan(values)
+    is_finite = np.isfinite(values)
+
+    formatted = np.char.mod(f"%.{digits}f", values)
+    if digits > 0 and is_finite.any():
+        # Remove the trailing zeros that all the finite values have,
+        # but keep at least one digit after the decimal point
+        numbers = formatted[is_finite]
+        trailing_zeros = np.char.str_len(numbers) - np.char.str_len(
+            np.char.rstrip(numbers, "0")
+        )
+        precision = max(digits - int(trailing_zeros.min()), 1)
+        if precision < digits:
+            formatted = np.char.mod(f"%.{precision}f", values)
+    formatted = formatted.astype(object)
+    formatted[is_nan] = "NaN"
+
+    abs_values = np.abs(values)
+    too_long = (
+        len(values) > 0 and np.char.str_len(formatted.astype(str)).max() > digits + 6
+    )
+    has_large_values = (abs_values > 1e6).any()
+    has_small_values = ((abs_values < 10 ** (-digits)) & (abs_values > 0)).any()
+    if has_small_values or (too_long and has_large_values):
+        formatted = np.char.mod(f"%.{digits}e", values).astype(object)
+        formatted[is_nan] = "NaN"
+
+    return formatted.tolist()
+
+
+def _pandas_format_array(values) -> "list[str]":
+    import pandas.io.formats.format as fmt
+
+    try:
+        return fmt.format_array(values, None, justify="all", leading_space=False)  # type: ignore
+    except TypeError:
+        # Older versions of Pandas don't have 'leading_space'
+        return fmt.format_array(values, None, justify="all")  # type: ignore
+
+
+def _format_pandas_string_categorical(x, escape_html: bool) -> "list[str]":
+    """Format a Pandas categorical column with string categories: the categories
+    (and the missing value) are formatted once, and then taken by code"""
+    np = sys.modules["numpy"]
+    # The missing value (code=-1) is formatted last
+    na_value = getattr(x.cat.categories.dtype, "na_value", np.nan)
+    categories = np.array([*x.cat.categories, na_value], dtype=object)
+    formatted = _pandas_format_array(categories)
+    if escape_html:
+        formatted = escape_html_chars_in_column(formatted)
+    return np.array(formatted, dtype=object).take(x.cat.codes.to_numpy()).tolist()
+
+
 def _polars_categories(x) -> "list[Any]":
     """Return the ordered categories of a Polars Categorical or Enum series"""
     pl = sys.modules["polars"]
@@ -61,7 +152,7 @@ def _polars_categories(x) -> "list[Any]":
     # categories this particular column uses. We collect them from the values, and
     # sort them, which is reproducible and consistent with how Polars itself sorts
     # a Categorical column #607
-    return sorted(x.unique().drop_nulls().to_list())
+    return x.cast(pl.String).unique().drop_nulls().sort().to_list()
 
 
 def _narwhals_categories(x) -> "list[Any]":
@@ -75,16 +166,228 @@ def _narwhals_categories(x) -> "list[Any]":
     return sorted(x.unique().drop_nulls().to_list())
 
 
+# The datetimes that Javascript's Date.toISOString() formats as YYYY-MM-DDTHH:MM:SS,
+# i.e. from 0001-01-01 to 9999-12-31, in microseconds since the epoch
+_MIN_EPOCH_US = -62_135_596_800_000_000
+_MAX_EPOCH_US = 253_402_300_799_999_999
+
+"""The largest integer that Javascript numbers represent exactly. Larger
+integers are parsed as BigInt by parseJSON"""
+MAX_SAFE_INTEGER = 2**53 - 1
+
+
+def _epoch_datetime_format(
+    epochs_us, fraction: "Union[int, Literal['auto']]", null: str
+) -> "Optional[dict[str, Any]]":
+    """Return the descriptor of a datetime column sent as epochs, given the
+    (non-null) number of microseconds since the epoch of its values, or None if
+    the column can't be displayed by the browser"""
+    if len(epochs_us) and (
+        epochs_us.min() < _MIN_EPOCH_US or epochs_us.max() > _MAX_EPOCH_US
+    ):
+        return None
+    # When all the values are multiples of one millisecond, we send milliseconds
+    unit = "us" if (epochs_us % 1000 != 0).any() else "ms"
+    if (
+        unit == "us"
+        and len(epochs_us)
+        and (epochs_us.min() < -MAX_SAFE_INTEGER or epochs_us.max() > MAX_SAFE_INTEGER)
+    ):
+        # The render function can't do arithmetic on BigInt values
+        return None
+    return {"unit": unit, "fraction": fraction, "date_only": False, "null": null}
+
+
+def pandas_datetime_epochs(x) -> "Optional[tuple[list[Any], dict[str, Any]]]":
+    """Return the values of a timezone-naive Pandas datetime column as integers
+    (milliseconds or microseconds since the epoch), together with a descriptor of
+    how Pandas displays them, or None if the column can't be sent as epochs"""
+    np = sys.modules["numpy"]
+    if x.dtype.kind != "M" or getattr(x.dtype, "tz", None) is not None:
+        return None
+    values = x.to_numpy()
+    is_nat = np.isnat(values)
+    epochs = values.astype("datetime64[us]")
+    if (epochs[~is_nat] != values[~is_nat]).any():
+        # Javascript numbers can't represent nanoseconds since the epoch
+        return None
+    epochs = epochs.astype(np.int64)
+    valid = epochs[~is_nat]
+
+    # Pandas displays the same number of decimals for all the values
+    sub_seconds = valid % 1_000_000
+    fraction = 6 if (sub_seconds % 1000 != 0).any() else 3 if sub_seconds.any() else 0
+    datetime_format = _epoch_datetime_format(valid, fraction, "NaT")
+    if datetime_format is None:
+        return None
+    datetime_format["date_only"] = not (valid % 86_400_000_000).any()
+
+    if datetime_format["unit"] == "ms":
+        epochs = epochs // 1000
+    result = epochs.astype(object)
+    result[is_nat] = None
+    return result.tolist(), datetime_format
+
+
+def polars_datetime_epochs(x) -> "Optional[tuple[list[Any], dict[str, Any]]]":
+    """Return the values of a Polars Date or timezone-naive Datetime column as
+    integers (milliseconds or microseconds since the epoch), together with a
+    descriptor of how we display them, or None if the column can't be sent as
+    epochs"""
+    pl = sys.modules["polars"]
+    dtype = x.dtype
+    if dtype == pl.Date:
+        date_only = True
+    elif dtype == pl.Datetime and getattr(dtype, "time_zone", None) is None:
+        date_only = False
+        if dtype.time_unit == "ns" and (x.dt.nanosecond() % 1000 != 0).any():
+            # Javascript numbers can't represent nanoseconds since the epoch
+            return None
+    else:
+        return None
+
+    epochs = x.cast(pl.Datetime("us")).dt.epoch("us")
+    # Polars displays as many decimals as each value needs (%.f)
+    datetime_format = _epoch_datetime_format(
+        epochs.drop_nulls().to_numpy(), "auto", "null"
+    )
+    if datetime_format is None:
+        return None
+    datetime_format["date_only"] = date_only
+
+    if datetime_format["unit"] == "ms":
+        epochs = epochs // 1000
+    return epochs.to_list(), datetime_format
+
+
+def _polars_list_len_limit() -> int:
+    """The number of items shown in a list cell, cf. pl.Config.set_fmt_table_cell_list_len"""
+    list_len = os.environ.get("POLARS_FMT_TABLE_CELL_LIST_LEN", "")
+    try:
+        return int(list_len)
+    except ValueError:
+        return 3
+
+
+def _polars_format_expression(expr, dtype, nested: bool = False) -> Any:
+    """Return a Polars expression that formats a column of the given dtype like
+    Polars does (cf. _s.get_fmt), or None if that dtype is not covered"""
+    pl = sys.modules["polars"]
+    if dtype == pl.Date:
+        formatted = expr.dt.to_string("%Y-%m-%d")
+    elif dtype == pl.Time:
+        formatted = expr.dt.to_string("%H:%M:%S%.f")
+    elif dtype == pl.Datetime:
+        datetime_format = "%Y-%m-%d %H:%M:%S%.f"
+        if dtype.time_zone is not None:  # type: ignore
+            datetime_format += " %Z"
+        formatted = expr.dt.to_string(datetime_format)
+    elif dtype == pl.Decimal:
+        formatted = expr.cast(pl.String)
+    elif nested and (dtype == pl.Boolean or dtype.is_integer()):
+        formatted = expr.cast(pl.String)
+    elif nested and dtype == pl.String:
+        formatted = pl.lit('"') + expr + pl.lit('"')
+    elif dtype == pl.List:
+        items = _polars_format_expression(pl.element(), dtype.inner, nested=True)  # type: ignore
+        list_len = _polars_list_len_limit()
+        if items is None or 0 <= list_len < 2:
+            return None
+        items = expr.list.eval(items)
+        formatted = pl.lit("[") + items.list.join(", ") + pl.lit("]")
+        if list_len >= 0:
+            # Long lists are shown as '[0, 1, … 9]'
+            truncated = (
+                pl.lit("[")
+                + items.list.head(list_len - 1).list.join(", ")
+                + pl.lit(", … ")
+                + items.list.last()
+                + pl.lit("]")
+            )
+            formatted = (
+                pl.when(expr.list.len() > list_len).then(truncated).otherwise(formatted)
+            )
+    elif dtype == pl.Struct:
+        fields = [
+            _polars_format_expression(expr.struct.field(field.name), field.dtype, True)
+            for field in dtype.fields  # type: ignore
+        ]
+        if not fields or any(field is None for field in fields):
+            return None
+        formatted = pl.when(expr.is_not_null()).then(
+            pl.lit("{") + pl.concat_str(fields, separator=",") + pl.lit("}")
+        )
+    else:
+        return None
+    return formatted.fill_null("null")
+
+
+def _polars_escape_html_expression(expr) -> Any:
+    """A Polars expression that escapes the HTML special characters, like escape_html_chars"""
+    return (
+        expr.str.replace_all("&", "&amp;", literal=True)
+        .str.replace_all("<", "&lt;", literal=True)
+        .str.replace_all(">", "&gt;", literal=True)
+    )
+
+
+def _format_polars_columns_with_expressions(
+    df, escape_html: bool = False, skip_columns: Optional[set[int]] = None
+) -> "dict[int, list[str]]":
+    """Format the temporal, decimal, list and struct columns of a Polars DataFrame
+    using Polars expressions, all evaluated in a single select.
+
+    With escape_html=True, the HTML special characters are escaped in the
+    same select, and large String columns are escaped there too."""
+    pl = sys.modules["polars"]
+    expressions = {}
+    for i, (name, dtype) in enumerate(df.schema.items()):
+        if dtype == pl.Categorical or dtype == pl.Enum:
+            continue
+        if skip_columns and i in skip_columns:
+            continue
+        if dtype == pl.String:
+            if not escape_html or len(df) < BULK_HTML_ESCAPING_MIN_ROWS:
+                continue
+            expr = pl.col(name)
+        else:
+            try:
+                expr = _polars_format_expression(pl.col(name), dtype)
+            except AttributeError:
+                # Older versions of Polars
+                expr = None
+        if expr is not None:
+            if escape_html:
+                expr = _polars_escape_html_expression(expr)
+            expressions[i] = expr.alias(str(i))
+
+    if not expressions:
+        return {}
+
+    try:
+        formatted = df.select(list(expressions.values()))
+    except pl.exceptions.PolarsError:
+        return {}
+
+    return {i: formatted[str(i)].to_list() for i in expressions}
+
+
 def _format_polars_series(
     x,
     escape_html: bool,
     format_floats_in_python: bool,
     warn_on_polars_get_fmt_not_found: bool,
     add_rank_to_categories: bool,
+    formatted: Optional["list[str]"] = None,
 ) -> Sequence[Any]:
-    """Format a Polars Series for DataTables display"""
+    """Format a Polars Series for DataTables display.
+
+    The values of the columns that _format_polars_columns_with_expressions
+    could format (and escape, if escape_html is set) are passed in 'formatted'."""
     pl = sys.modules["polars"]
     dtype = x.dtype
+    if formatted is not None:
+        return formatted
 
     # Boolean and integer types - return as-is
     if dtype in (
@@ -101,7 +404,7 @@ def _format_polars_series(
         return x.to_list()
 
     if dtype.is_float() and not format_floats_in_python:
-        return [escape_non_finite_float(v) for v in x.to_list()]
+        return _escape_non_finite_polars_floats(x)
 
     if dtype == pl.String:
         formatted = x.to_list()
@@ -114,14 +417,9 @@ def _format_polars_series(
                 # null gets rank 0 (sorts first), categories are 1-indexed
                 return [0 if c is None else c + 1 for c in codes]
             # The physical representation of a Categorical is a global category id
-            # (#607), so we rank the values against the categories of that column
-            category_to_rank = {
-                cat: i + 1 for i, cat in enumerate(_polars_categories(x))
-            }
-            return [
-                0 if v is None else category_to_rank[v]
-                for v in x.cast(pl.String).to_list()
-            ]
+            # (#607), so we rank the values against the sorted categories of that
+            # column, cf. _polars_categories
+            return x.cast(pl.String).rank("dense").fill_null(0).to_list()
         formatted = x.cast(pl.String).to_list()
     else:
         # Other types - use Polars' native formatting
@@ -138,16 +436,14 @@ def _format_polars_series(
             formatted = [str(v) for v in x]
 
     if escape_html:
-        formatted = [escape_html_chars(i) for i in formatted]
+        formatted = escape_html_chars_in_column(formatted)
 
     if dtype.is_float():
         return [
-            (
-                [None, None]
-                if value is None
-                else [formatted_value, escape_non_finite_float(value)]
+            [None, None] if value is None else [formatted_value, value]
+            for formatted_value, value in zip(
+                formatted, _escape_non_finite_polars_floats(x)
             )
-            for formatted_value, value in zip(formatted, x)
         ]
 
     return formatted
@@ -172,34 +468,160 @@ def _format_narwhals_series(
         nw.UInt32,
         nw.UInt64,
     ):
-        return [v for v in x]
+        return x.to_list()
 
     # Float types - format and handle non-finite values
     if dtype.is_float() and not format_floats_in_python:
-        return [escape_non_finite_float(v) for v in x]
+        return _escape_non_finite_narwhals_floats(x)
+
+    # Categorical and Enum types
+    if isinstance(dtype, (nw.Categorical, nw.Enum)) and add_rank_to_categories:
+        categories = _narwhals_categories(x)
+        # null gets rank 0 (sorts first), categories are 1-indexed
+        return (
+            x.replace_strict(
+                categories, list(range(1, len(categories) + 1)), return_dtype=nw.Int64
+            )
+            .fill_null(0)
+            .cast(nw.Int64)
+            .to_list()
+        )
+
+    if dtype.is_float():
+        return _format_narwhals_floats(x)
+
+    if dtype == nw.String:
+        if not x.null_count():
+            return (_narwhals_escape_html(x) if escape_html else x).to_list()
+        # The missing values keep the representation of the backend,
+        # e.g. 'None' with Polars, and 'nan' or '<NA>' with Pandas
+        is_null = x.is_null()
+        null_values = [str(v) for v in x.filter(is_null)]
+        if escape_html:
+            null_values = escape_html_chars_in_column(null_values)
+            x = _narwhals_escape_html(x.fill_null(""))
+        formatted = x.to_list()
+        for i, value in zip(compress(count(), is_null.to_list()), null_values):
+            formatted[i] = value
+        return formatted
 
     formatted = [str(v) for v in x]
     if escape_html:
-        formatted = [escape_html_chars(i) for i in formatted]
+        formatted = escape_html_chars_in_column(formatted)
+    return formatted
 
-    if dtype.is_float():
+
+def _narwhals_float_values(x) -> "tuple[Any, Any, Any]":
+    """Return the values of a Narwhals float Series as a NumPy float array,
+    together with its NaN and null masks, or None if NumPy is not available
+    or the values can't be converted"""
+    np = sys.modules.get("numpy")
+    if np is None:
+        return None, None, None
+    try:
+        values = np.asarray(x.to_numpy(), dtype=np.float64)
+    except (TypeError, ValueError):
+        # e.g. pd.NA in an object array
+        return None, None, None
+    is_nan = x.is_nan().fill_null(False).to_numpy().astype(bool)
+    # Nulls become NaN in to_numpy(), so we use Narwhals' masks to tell them apart
+    # (NaN values count as nulls in the pandas-like backends)
+    is_null = (
+        (x.is_null().to_numpy().astype(bool) & ~is_nan) if x.null_count() else None
+    )
+    return values, is_nan, is_null
+
+
+def _escape_non_finite_narwhals_floats(x) -> "list[Any]":
+    """Vectorized version of escape_non_finite_float for a Narwhals float Series"""
+    values, is_nan, is_null = _narwhals_float_values(x)
+    if values is None:
+        return [escape_non_finite_float(v) for v in x.to_list()]
+    return _escape_non_finite_numpy_floats(values, is_nan, is_null)
+
+
+def _format_narwhals_floats(x) -> "list[Any]":
+    """Format a Narwhals float Series as [display, value] pairs"""
+    values, is_nan, is_null = _narwhals_float_values(x)
+    if values is None:
         return [
             (
                 [None, None]
                 if value is None
-                else [formatted_value, escape_non_finite_float(value)]
+                else [str(value), escape_non_finite_float(value)]
             )
-            for formatted_value, value in zip(formatted, x)
+            for value in x.to_list()
         ]
 
-    # Categorical and Enum types
-    if isinstance(dtype, (nw.Categorical, nw.Enum)) and add_rank_to_categories:
-        categories = _narwhals_categories(x)
-        category_to_rank = {cat: i + 1 for i, cat in enumerate(categories)}
-        # null gets rank 0 (sorts first), categories are 1-indexed
-        return [0 if v is None else category_to_rank.get(v, 0) for v in x.to_list()]
+    # NumPy formats the float64 values like str() does
+    formatted = values.astype(str).tolist()
+    escaped = _escape_non_finite_numpy_floats(values, is_nan, is_null)
+    if is_null is None:
+        return [list(pair) for pair in zip(formatted, escaped)]
+    return [
+        [None, None] if null else [formatted_value, value]
+        for formatted_value, value, null in zip(formatted, escaped, is_null.tolist())
+    ]
 
-    return formatted
+
+def _format_pyarrow_column(
+    x, escape_html: bool, format_floats_in_python: bool
+) -> "Optional[list[Any]]":
+    """Format a PyArrow ChunkedArray like _format_narwhals_series does, but with
+    pyarrow.compute and NumPy rather than one Python object per cell.
+
+    Return None for the types that are not handled here."""
+    pa = sys.modules["pyarrow"]
+    import pyarrow.compute as pc
+
+    dtype = x.type
+    if pa.types.is_dictionary(dtype) and _is_pyarrow_string(dtype.value_type):
+        # Decode the dictionary
+        x = x.cast(dtype.value_type)
+        dtype = x.type
+
+    if pa.types.is_boolean(dtype) or pa.types.is_integer(dtype):
+        return x.to_pylist()
+
+    if _is_pyarrow_string(dtype):
+        # _format_narwhals_series displays the missing values as str(None)
+        x = pc.fill_null(x, "None")
+        if escape_html:
+            x = pc.replace_substring(x, "&", "&amp;")
+            x = pc.replace_substring(x, "<", "&lt;")
+            x = pc.replace_substring(x, ">", "&gt;")
+        return x.to_pylist()
+
+    np = sys.modules.get("numpy")
+    if np is None or not (pa.types.is_float32(dtype) or pa.types.is_float64(dtype)):
+        return None
+
+    # Nulls become NaN in to_numpy(), so we use Arrow's own masks to tell them apart
+    values = x.to_numpy()
+    is_null = pc.is_null(x).to_numpy() if x.null_count else None
+    escaped = _escape_non_finite_numpy_floats(
+        values, pc.fill_null(pc.is_nan(x), False).to_numpy(), is_null
+    )
+    if not format_floats_in_python:
+        return escaped
+
+    # NumPy formats the float64 values like str() does
+    formatted = values.astype(np.float64).astype(str).tolist()
+    if is_null is None:
+        return [list(pair) for pair in zip(formatted, escaped)]
+    return [
+        [None, None] if null else [formatted_value, value]
+        for formatted_value, value, null in zip(formatted, escaped, is_null.tolist())
+    ]
+
+
+def _is_pyarrow_string(dtype) -> bool:
+    pa = sys.modules["pyarrow"]
+    return (
+        pa.types.is_string(dtype)
+        or pa.types.is_large_string(dtype)
+        or getattr(pa.types, "is_string_view", lambda _: False)(dtype)
+    )
 
 
 def escape_non_finite_float(value: Any) -> Any:
@@ -217,7 +639,94 @@ def escape_non_finite_float(value: Any) -> Any:
         return "___Infinity___"
     if value == -math.inf:
         return "___-Infinity___"
-    return value
+    # orjson would encode NumPy float32 values with fewer digits than json
+    return float(value)
+
+
+# How the non-finite floats are displayed, cf. format_float_values
+_NON_FINITE_FLOAT_DISPLAY = {
+    "___NaN___": "NaN",
+    "___Infinity___": "inf",
+    "___-Infinity___": "-inf",
+}
+_FIXED_POINT_RE = re.compile(r"-?([0-9]+)(?:\.([0-9]+))?")
+
+
+def scale_float_column(pairs: Sequence[Any]) -> "Optional[tuple[list[Any], int]]":
+    """Turn a float column formatted as [display, value] pairs into integers,
+    i.e. the display values scaled by 10^precision, when all the display
+    values have the same number of decimals. Returns the scaled column and
+    the precision, or None if the column can't be scaled exactly."""
+    scaled: list[Any] = []
+    precision = None
+    for display, value in pairs:
+        if display is None:
+            scaled.append(None)
+            continue
+        if isinstance(value, str):
+            # non-finite value
+            if _NON_FINITE_FLOAT_DISPLAY.get(value) != display:
+                return None
+            scaled.append(value)
+            continue
+        match = _FIXED_POINT_RE.fullmatch(display)
+        if match is None:
+            # e.g. scientific notation
+            return None
+        decimals = len(match.group(2) or "")
+        if precision is None:
+            precision = decimals
+        elif decimals != precision:
+            return None
+        scaled_value = int(display.replace(".", ""))
+        if abs(scaled_value) > MAX_SAFE_INTEGER:
+            return None
+        if scaled_value == 0 and display.startswith("-"):
+            # -0.0 would be displayed as 0.0
+            return None
+        scaled.append(scaled_value)
+    return scaled, precision or 0
+
+
+def escape_non_finite_floats(values: Any) -> "list[Any]":
+    """Encode the non-finite values of a float array, in bulk.
+
+    NumPy arrays are processed with masks, rather than one escape_non_finite_float
+    call per value; other arrays (e.g. Pandas nullable or Arrow-backed floats,
+    where missing values are pd.NA) use the per-value function."""
+    np = sys.modules.get("numpy")
+    if np is None or not isinstance(values, np.ndarray):
+        return [escape_non_finite_float(v) for v in values]
+    return _escape_non_finite_numpy_floats(values, np.isnan(values))
+
+
+def _escape_non_finite_numpy_floats(
+    values: Any, is_nan: Any, is_null: Any = None
+) -> "list[Any]":
+    """Replace the NaN and infinite values of a NumPy float array with the
+    sentinels that parseJSON decodes, and return the values as a list"""
+    np = sys.modules["numpy"]
+    # astype(object) gives Python floats, which json encodes natively
+    escaped = values.astype(object)
+    escaped[is_nan] = "___NaN___"
+    escaped[values == np.inf] = "___Infinity___"
+    escaped[values == -np.inf] = "___-Infinity___"
+    if is_null is not None:
+        escaped[is_null] = None
+    return escaped.tolist()
+
+
+def _escape_non_finite_polars_floats(x) -> "list[Any]":
+    """Vectorized version of escape_non_finite_float for a Polars float Series"""
+    np = sys.modules.get("numpy")
+    if np is None:
+        return [escape_non_finite_float(v) for v in x.to_list()]
+    # Nulls become NaN in to_numpy(), so we use Polars' own masks to tell them apart
+    return _escape_non_finite_numpy_floats(
+        x.to_numpy(),
+        x.is_nan().fill_null(False).to_numpy(),
+        x.is_null().to_numpy() if x.null_count() else None,
+    )
 
 
 def escape_html_chars(value: Any) -> Any:
@@ -227,6 +736,116 @@ def escape_html_chars(value: Any) -> Any:
     return value
 
 
+"""Columns with at least that many rows are HTML-escaped in bulk"""
+BULK_HTML_ESCAPING_MIN_ROWS = 1000
+
+
+def escape_html_chars_in_column(values: Sequence[Any]) -> "list[Any]":
+    """Escape the HTML special characters in a column of values.
+
+    Large columns of strings are escaped in bulk: the values are joined into
+    a single string, which is escaped and split again, or even returned as-is
+    when it does not contain any special character."""
+    if len(values) < BULK_HTML_ESCAPING_MIN_ROWS:
+        return [escape_html_chars(v) for v in values]
+
+    try:
+        joined = "\x00".join(values)
+    except TypeError:
+        # Not all the values are strings
+        return [escape_html_chars(v) for v in values]
+
+    if "&" not in joined and "<" not in joined and ">" not in joined:
+        return list(values)
+
+    if joined.count("\x00") != len(values) - 1:
+        # The separator appears in the values
+        return [escape_html_chars(v) for v in values]
+
+    return escape_html_chars(joined).split("\x00")
+
+
+def _narwhals_escape_html(x) -> Any:
+    """Escape the HTML special characters in a Narwhals String series"""
+    return (
+        x.str.replace_all("&", "&amp;", literal=True)
+        .str.replace_all("<", "&lt;", literal=True)
+        .str.replace_all(">", "&gt;", literal=True)
+    )
+
+
+def _column_as_list(x: Sequence[Any]) -> "list[Any]":
+    """Return a formatted column as a list, e.g. to encode it with json"""
+    if isinstance(x, list):
+        return x
+    if hasattr(x, "tolist"):
+        # Pandas Series returned as-is by _format_pandas_series
+        return x.tolist()  # type: ignore
+    return list(x)
+
+
+"""String columns with at least that many rows, and at most that ratio of
+distinct values, are dictionary-encoded when dictionary_encoding is "auto" """
+DICTIONARY_ENCODING_MIN_ROWS = 1000
+DICTIONARY_ENCODING_MAX_CARDINALITY_RATIO = 0.1
+
+
+def string_column_dictionary(values: Sequence[Any]) -> "Optional[list[str]]":
+    """Return the sorted list of the distinct values in a formatted column,
+    or None if the column has values other than strings and nulls"""
+    if not isinstance(values, list):
+        # e.g. a Pandas Series of booleans or integers
+        return None
+    try:
+        distinct_values = set(values)
+    except TypeError:
+        # unhashable values
+        return None
+    distinct_values.discard(None)
+    if not all(isinstance(value, str) for value in distinct_values):
+        return None
+    return sorted(distinct_values)
+
+
+def dictionary_encode_column(
+    values: Sequence[Any], dictionary: Sequence[str]
+) -> "list[int]":
+    """Replace the values of a string column by their 1-based
+    position in the dictionary (0 = missing)"""
+    codes: dict[Optional[str], int] = {
+        value: i for i, value in enumerate(dictionary, 1)
+    }
+    codes[None] = 0
+    return list(map(codes.__getitem__, values))
+
+
+def _encode_special_type(o: Any, warn_on_unexpected_types: bool) -> Any:
+    """Convert a value that the JSON encoders don't know about, e.g. a numpy scalar"""
+    module = type(o).__module__
+    if module == "numpy":
+        import numpy as np
+
+        if isinstance(o, np.bool_):
+            return bool(o)
+        if isinstance(o, np.integer):
+            return int(o)
+        if isinstance(o, np.floating):
+            return float(o)
+    pd = sys.modules.get("pandas", None)
+    if pd is not None and o is pd.NA:
+        return str(o)
+
+    if warn_on_unexpected_types:
+        warnings.warn(
+            f"Unexpected type '{type(o)}' for '{o}'.\n"
+            "You can report this warning at https://github.com/mwouts/itables/issues\n"
+            "To silence this warning, please run:\n"
+            "    itables.options.warn_on_unexpected_types = False",
+            category=RuntimeWarning,
+        )
+    return str(o)
+
+
 def generate_encoder(warn_on_unexpected_types: bool = True) -> Any:
     """Generate a JSON encoder that can handle special types like numpy"""
 
@@ -234,101 +853,360 @@ def generate_encoder(warn_on_unexpected_types: bool = True) -> Any:
         def default(self, o):
             if isinstance(o, (bool, int, float, str)):
                 return json.JSONEncoder.default(self, o)
-            module = type(o).__module__
-            if module == "numpy":
-                import numpy as np
-
-                if isinstance(o, np.bool_):
-                    return bool(o)
-                if isinstance(o, np.integer):
-                    return int(o)
-                if isinstance(o, np.floating):
-                    return float(o)
-            pd = sys.modules.get("pandas", None)
-            if pd is not None and o is pd.NA:
-                return str(o)
-
-            if warn_on_unexpected_types:
-                warnings.warn(
-                    f"Unexpected type '{type(o)}' for '{o}'.\n"
-                    "You can report this warning at https://github.com/mwouts/itables/issues\n"
-                    "To silence this warning, please run:\n"
-                    "    itables.options.warn_on_unexpected_types = False",
-                    category=RuntimeWarning,
-                )
-            return str(o)
+            return _encode_special_type(o, warn_on_unexpected_types)
 
     return TableValuesEncoder
 
 
-def datatables_rows(
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+_SCAN_CHUNK_SIZE = 2**16
+
+
+def _contains_non_finite_float(data: Any) -> bool:
+    """Whether data (lists, tuples, dicts and NumPy arrays) contains a NaN or an
+    infinite float, which orjson encodes as null. The lists are scanned with
+    map and itertools, rather than with a Python loop over their items."""
+    np = sys.modules.get("numpy")
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, (list, tuple)):
+            types = set(map(type, value))
+            if float in types:
+                floats = compress(value, map(is_, map(type, value), repeat(float)))
+                if not all(map(math.isfinite, floats)):
+                    return True
+            if types <= {list, tuple}:
+                # e.g. the rows of the table, which we flatten lazily, in
+                # chunks of bounded size, to avoid a copy of the whole table
+                items = chain.from_iterable(value)
+                chunks = iter(lambda: list(islice(items, _SCAN_CHUNK_SIZE)), [])
+                if any(map(_contains_non_finite_float, chunks)):
+                    return True
+                continue
+            containers = types.difference(_JSON_SCALAR_TYPES)
+            if containers:
+                stack.extend(v for v in value if type(v) in containers)
+        elif isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.append(list(value.values()))
+        elif np is not None and isinstance(value, np.ndarray):
+            if value.dtype.kind == "f":
+                if not np.isfinite(value).all():
+                    return True
+            elif value.dtype.kind == "O":
+                stack.append(value.ravel().tolist())
+        elif np is not None and isinstance(value, np.floating):
+            if not np.isfinite(value):
+                return True
+    return False
+
+
+def get_json_encoder_backend(
+    json_encoder: Literal["auto", "stdlib", "orjson"],
+) -> Literal["stdlib", "orjson"]:
+    """Return the JSON encoder backend to be used: in mode 'auto'
+    we use orjson when it is installed, and the json module otherwise"""
+    if json_encoder == "auto":
+        try:
+            import orjson  # noqa: F401
+        except ImportError:
+            return "stdlib"
+        return "orjson"
+    if json_encoder not in ("stdlib", "orjson"):
+        raise ValueError(
+            f"json_encoder must be one of 'auto', 'stdlib' or 'orjson', not {json_encoder!r}"
+        )
+    return json_encoder
+
+
+def encode_table_values(
+    data: Any,
+    *,
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+    warn_on_unexpected_types: bool = False,
+    sort_keys: bool = False,
+) -> str:
+    """Encode the table data (or any other DataTable argument) to JSON.
+
+    Non-finite floats are expected to have been escaped already (see
+    escape_non_finite_float), as JSON has no representation for them.
+
+    The orjson backend serializes NumPy arrays and scalars natively. It does
+    not support integers beyond 64 bits, so in that case we fall back to the
+    json module (large integers are decoded as BigInts by parseJSON).
+    Like the json module, it raises a ValueError on non-finite floats, which
+    orjson would otherwise encode as null."""
+    if get_json_encoder_backend(json_encoder) == "orjson":
+        import orjson
+
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            encoded = orjson.dumps(
+                data,
+                default=lambda o: _encode_special_type(o, warn_on_unexpected_types),
+                option=option,
+            )
+        except TypeError:
+            pass
+        else:
+            if b"null" in encoded and _contains_non_finite_float(data):
+                raise ValueError("Out of range float values are not JSON compliant")
+            return encoded.decode("utf-8")
+
+    return json.dumps(
+        data,
+        cls=generate_encoder(warn_on_unexpected_types),
+        allow_nan=False,
+        sort_keys=sort_keys,
+    )
+
+
+def format_columns(
     df: DataFrameOrSeries,
     *,
-    column_count: Optional[int] = None,
     escape_html: bool = True,
     float_columns_to_be_formatted_in_python: Optional[set[int]] = None,
     categorical_columns_to_be_represented_through_their_rank: Optional[set[int]] = None,
-    warn_on_unexpected_types: bool = False,
     warn_on_polars_get_fmt_not_found: bool = True,
-) -> str:
-    """Format the values in the table and return the data, row by row, as requested by DataTables"""
+    formatting_workers: int = 0,
+    preformatted_columns: "Optional[dict[int, Sequence[Any]]]" = None,
+) -> "list[Sequence[Any]]":
+    """Format the values in the table and return them column by column.
+
+    With formatting_workers > 1, the columns are formatted concurrently
+    in a pool of threads, and returned in their original order.
+    The columns in preformatted_columns are returned as-is."""
     # We iterate over columns using an index rather than the column name
     # to avoid an issue in case of duplicated column names #89
-    if column_count is None or len(df.columns) == column_count:
-        empty_columns = []
-    else:
-        # When the header requires more columns (#141), we append empty columns on the left
-        missing_columns = column_count - len(df.columns)
-        assert missing_columns > 0
-        empty_columns = [[None] * len(df)] * missing_columns
-
     df_module = get_dataframe_module_name(df)
     if float_columns_to_be_formatted_in_python is None:
         float_columns_to_be_formatted_in_python = set()
     if categorical_columns_to_be_represented_through_their_rank is None:
         categorical_columns_to_be_represented_through_their_rank = set()
+    if preformatted_columns is None:
+        preformatted_columns = {}
     if df_module == "pandas":
-        formatted_columns = [
-            _format_pandas_series(
-                x,
+        columns = [x for _, x in df.items()]
+
+        def format_column(i: int) -> Sequence[Any]:
+            if i in preformatted_columns:
+                return preformatted_columns[i]
+            return _format_pandas_series(
+                columns[i],
                 escape_html,
                 i in float_columns_to_be_formatted_in_python,
                 i in categorical_columns_to_be_represented_through_their_rank,
             )
-            for i, (_, x) in enumerate(df.items())
-        ]
+
     elif df_module == "polars":
-        formatted_columns = [
-            _format_polars_series(
-                df[col],
+        formatted_with_expressions = _format_polars_columns_with_expressions(
+            df, escape_html, set(preformatted_columns)
+        )
+        columns = df.get_columns()
+
+        def format_column(i: int) -> Sequence[Any]:
+            if i in preformatted_columns:
+                return preformatted_columns[i]
+            return _format_polars_series(
+                columns[i],
                 escape_html,
                 i in float_columns_to_be_formatted_in_python,
                 warn_on_polars_get_fmt_not_found,
                 i in categorical_columns_to_be_represented_through_their_rank,
+                formatted=formatted_with_expressions.get(i),
             )
-            for i, col in enumerate(df.columns)
-        ]
+
     else:
         # Other DataFrame types are handled via Narwhals, and are expected
         # to have been converted to Narwhals already (except in tests)
         import narwhals as nw
 
         df = nw.from_native(df, eager_only=True, allow_series=True)
+        columns = [df[col] for col in df.columns]
+        # PyArrow tables are formatted with pyarrow.compute when possible
+        is_pyarrow = nw.get_native_namespace(df).__name__ == "pyarrow"
 
-        formatted_columns = [
-            _format_narwhals_series(
-                df[col],
+        def format_column(i: int) -> Sequence[Any]:
+            if i in preformatted_columns:
+                return preformatted_columns[i]
+            if (
+                is_pyarrow
+                and i not in categorical_columns_to_be_represented_through_their_rank
+            ):
+                formatted = _format_pyarrow_column(
+                    columns[i].to_native(),
+                    escape_html,
+                    i in float_columns_to_be_formatted_in_python,
+                )
+                if formatted is not None:
+                    return formatted
+            return _format_narwhals_series(
+                columns[i],
                 escape_html,
                 i in float_columns_to_be_formatted_in_python,
                 i in categorical_columns_to_be_represented_through_their_rank,
             )
-            for i, col in enumerate(df.columns)
-        ]
 
-    data = list(zip(*(empty_columns + formatted_columns)))
+    if formatting_workers > 1 and len(columns) > 1:
+        from concurrent.futures import ThreadPoolExecutor
 
-    return json.dumps(
+        with ThreadPoolExecutor(
+            max_workers=min(formatting_workers, len(columns))
+        ) as executor:
+            return list(executor.map(format_column, range(len(columns))))
+
+    return [format_column(i) for i in range(len(columns))]
+
+
+def _with_empty_columns(
+    formatted_columns: "Sequence[Sequence[Any]]",
+    row_count: int,
+    column_count: Optional[int],
+) -> "list[Sequence[Any]]":
+    if column_count is None or len(formatted_columns) == column_count:
+        return list(formatted_columns)
+
+    # When the header requires more columns (#141), we append empty columns on the left
+    missing_columns = column_count - len(formatted_columns)
+    assert missing_columns > 0
+    return [[None] * row_count] * missing_columns + list(formatted_columns)
+
+
+def encode_columns(
+    formatted_columns: "Sequence[Sequence[Any]]",
+    *,
+    row_count: int,
+    column_count: Optional[int] = None,
+    warn_on_unexpected_types: bool = False,
+    orient: Literal["rows", "columns"] = "rows",
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+) -> str:
+    """Encode the formatted columns to JSON, row by row as requested by DataTables,
+    or column by column with orient="columns" """
+    columns = _with_empty_columns(formatted_columns, row_count, column_count)
+
+    if orient == "columns":
+        data = [_column_as_list(x) for x in columns]
+    else:
+        data = list(zip(*columns))
+
+    return encode_table_values(
         data,
-        cls=generate_encoder(warn_on_unexpected_types),
-        allow_nan=False,
+        json_encoder=json_encoder,
+        warn_on_unexpected_types=warn_on_unexpected_types,
+    )
+
+
+"""The number of rows encoded at once by iter_encoded_columns"""
+DATA_JSON_CHUNK_ROWS = 10_000
+
+
+def iter_encoded_columns(
+    formatted_columns: "Sequence[Sequence[Any]]",
+    *,
+    row_count: int,
+    column_count: Optional[int] = None,
+    warn_on_unexpected_types: bool = False,
+    orient: Literal["rows", "columns"] = "rows",
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+    chunk_rows: int = DATA_JSON_CHUNK_ROWS,
+) -> Iterator[str]:
+    """Encode the formatted columns like encode_columns, but yield the JSON text
+    in pieces of at most chunk_rows rows (or one column at a time with
+    orient="columns"), so that the full JSON string is never held in memory"""
+    columns = [
+        _column_as_list(x)
+        for x in _with_empty_columns(formatted_columns, row_count, column_count)
+    ]
+    if orient == "columns":
+        chunks: Iterator[list[Any]] = ([x] for x in columns)
+    else:
+        chunks = (
+            list(zip(*(x[start : start + chunk_rows] for x in columns)))
+            for start in range(0, row_count, chunk_rows)
+        )
+
+    # The separator used by the encoder between two items of a list
+    separator = "," if get_json_encoder_backend(json_encoder) == "orjson" else ", "
+
+    yield "["
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        encoded = encode_table_values(
+            chunk,
+            json_encoder=json_encoder,
+            warn_on_unexpected_types=warn_on_unexpected_types,
+        )
+        # Remove the brackets around the chunk
+        yield encoded[1:-1] if first else separator + encoded[1:-1]
+        first = False
+    yield "]"
+
+
+def iter_compressed_data_json(data_json_chunks: Iterable[str]) -> Iterator[str]:
+    """Compress the data_json text with gzip and yield it as base64 text,
+    in pieces that can be concatenated"""
+    # wbits=31 gives the gzip format, which is the one supported by the
+    # DecompressionStream of the browsers
+    compressor = zlib.compressobj(wbits=31)
+    pending = b""
+    for chunk in data_json_chunks:
+        pending += compressor.compress(chunk.encode("utf-8"))
+        # base64 encodes three bytes at a time
+        complete = len(pending) - len(pending) % 3
+        if complete:
+            yield b64encode(pending[:complete]).decode("ascii")
+            pending = pending[complete:]
+    yield b64encode(pending + compressor.flush()).decode("ascii")
+
+
+def compress_data_json(data_json: str) -> str:
+    """Compress the data_json text with gzip and encode it in base64"""
+    return "".join(iter_compressed_data_json([data_json]))
+
+
+def decompress_data_json(compressed_data_json: str) -> str:
+    """The inverse of compress_data_json"""
+    return zlib.decompress(b64decode(compressed_data_json), wbits=31).decode("utf-8")
+
+
+def datatables_rows(
+    df: DataFrameOrSeries,
+    *,
+    column_count: Optional[int] = None,
+    escape_html: bool = True,
+    float_columns_to_be_formatted_in_python: Optional[set[int]] = None,
+    categorical_columns_to_be_represented_through_their_rank: Optional[set[int]] = None,
+    warn_on_unexpected_types: bool = False,
+    warn_on_polars_get_fmt_not_found: bool = True,
+    orient: Literal["rows", "columns"] = "rows",
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+    formatting_workers: int = 0,
+) -> str:
+    """Format the values in the table and return the data, row by row, as requested by DataTables.
+
+    With orient="columns" the data is returned column by column instead, and the
+    rows are reconstructed by the ITable class in dt_for_itables."""
+    formatted_columns = format_columns(
+        df,
+        escape_html=escape_html,
+        float_columns_to_be_formatted_in_python=float_columns_to_be_formatted_in_python,
+        categorical_columns_to_be_represented_through_their_rank=categorical_columns_to_be_represented_through_their_rank,
+        warn_on_polars_get_fmt_not_found=warn_on_polars_get_fmt_not_found,
+        formatting_workers=formatting_workers,
+    )
+    return encode_columns(
+        formatted_columns,
+        row_count=len(df),
+        column_count=column_count,
+        warn_on_unexpected_types=warn_on_unexpected_types,
+        orient=orient,
+        json_encoder=json_encoder,
     )
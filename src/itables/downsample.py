@@ -1,5 +1,6 @@
+import itertools
 import math
-from typing import Union
+from typing import Literal, Optional, Union
 
 from itables.typing import (
     DataFrameModuleName,
@@ -21,6 +22,124 @@ def nbytes(df: DataFrameOrSeries, df_module_name: DataFrameModuleName = None) ->
         return df.estimated_size()
 
 
+def column_nbytes(
+    df: DataFrameOrSeries, df_module_name: DataFrameModuleName = None
+) -> list[int]:
+    """Return an estimate for the number of bytes used by each column"""
+    if df_module_name is None:
+        df_module_name = get_dataframe_module_name(df)
+        assert df_module_name is not None
+
+    if df_module_name in ["pandas", "numpy"]:
+        return [x.values.nbytes for _, x in df.items()]
+    if df_module_name == "polars":
+        return [x.estimated_size() for x in df.get_columns()]
+    # Other DataFrames: we assume that all the columns have the same size
+    if not len(df.columns):
+        return []
+    total = nbytes(df, df_module_name)
+    return [total // len(df.columns)] * len(df.columns)
+
+
+"""The number of rows (taken at the top and bottom of the table) that are
+serialized to estimate the size of the table data with maxBytes_mode="serialized" """
+SERIALIZED_SIZE_SAMPLE_ROWS = 200
+
+
+def serialized_column_nbytes(
+    df: DataFrameOrSeries, df_module_name: DataFrameModuleName = None
+) -> list[int]:
+    """Return an estimate for the number of bytes that each column takes in
+    data_json. The first and last rows of the table are formatted and encoded
+    like in to_html_datatable (with the default options, and the json module,
+    whose output is at least as large as that of orjson), and the size of that
+    sample is extrapolated to the full table."""
+    from .datatables_format import encode_columns, encode_table_values, format_columns
+
+    if df_module_name is None:
+        df_module_name = get_dataframe_module_name(df)
+
+    rows = len(df)
+    if not rows or not len(df.columns):
+        return [0] * len(df.columns)
+
+    sample = _head_and_tail(
+        df, df_module_name, min(rows, SERIALIZED_SIZE_SAMPLE_ROWS), len(df.columns)
+    )
+    float_columns = {
+        i for i, x in enumerate(_iter_columns(sample, df_module_name)) if _is_float(x)
+    }
+    formatted_columns = format_columns(
+        sample,
+        escape_html=True,
+        float_columns_to_be_formatted_in_python=float_columns,
+        warn_on_polars_get_fmt_not_found=False,
+    )
+    column_sizes = [
+        len(
+            encode_table_values(
+                list(x), json_encoder="stdlib", warn_on_unexpected_types=False
+            )
+        )
+        for x in formatted_columns
+    ]
+    # The separators and brackets around each row are shared among the columns
+    sample_size = len(
+        encode_columns(formatted_columns, row_count=len(sample), json_encoder="stdlib")
+    )
+    scale = sample_size / max(sum(column_sizes), 1) * rows / len(sample)
+    return [int(size * scale) for size in column_sizes]
+
+
+def _iter_columns(df, df_module_name: DataFrameModuleName):
+    if df_module_name == "pandas":
+        return [x for _, x in df.items()]
+    if df_module_name == "polars":
+        return df.get_columns()
+    # Other DataFrames are handled via Narwhals
+    import narwhals as nw
+
+    df = nw.from_native(df, eager_only=True)
+    return [df[col] for col in df.columns]
+
+
+def _is_float(x) -> bool:
+    dtype = x.dtype
+    if hasattr(dtype, "is_float"):
+        # Polars
+        return dtype.is_float()
+    return getattr(dtype, "kind", None) == "f"
+
+
+def _column_nbytes(
+    df: DataFrameOrSeries,
+    df_module_name: DataFrameModuleName,
+    max_bytes_mode: Literal["memory", "serialized"],
+) -> list[int]:
+    if max_bytes_mode == "serialized":
+        return serialized_column_nbytes(df, df_module_name)
+    if max_bytes_mode != "memory":
+        raise ValueError(
+            f"maxBytes_mode should be 'memory' or 'serialized', not {max_bytes_mode!r}"
+        )
+    return column_nbytes(df, df_module_name)
+
+
+def _index_nbytes(
+    df: DataFrameOrSeries,
+    df_module_name: DataFrameModuleName,
+    max_bytes_mode: Literal["memory", "serialized"],
+    show_index: bool,
+) -> int:
+    """Return the number of bytes that the index columns (which are added
+    to the table data when showIndex is True) take in data_json"""
+    if not show_index or max_bytes_mode != "serialized" or df_module_name != "pandas":
+        return 0
+    from .javascript import safe_reset_index
+
+    return sum(serialized_column_nbytes(safe_reset_index(df.iloc[:, :0]), "pandas"))
+
+
 def as_nbytes(mem: Union[int, float, str]) -> int:
     if isinstance(mem, (int, float)):
         return int(mem)
@@ -45,23 +164,65 @@ def downsample(
     max_rows: int = 0,
     max_columns: int = 0,
     max_bytes: Union[int, str] = 0,
+    max_bytes_mode: Literal["memory", "serialized"] = "memory",
+    shape: Optional[tuple[int, int]] = None,
+    show_index: bool = False,
 ) -> tuple[DataFrameOrSeries, str]:
-    """Return a subset of the dataframe that fits the limits"""
+    """Return a subset of the dataframe that fits the limits.
+
+    With max_bytes_mode="memory", max_bytes is compared to the memory used by
+    the dataframe, and with max_bytes_mode="serialized", to an estimate of the
+    size of the table data in the HTML output, including the index columns
+    when show_index is True.
+
+    Polars LazyFrames are collected, but only the rows and columns that fit
+    the limits are materialized. Their shape (which requires a query)
+    can be passed as 'shape' if it is already known."""
     if df_module_name is None:
         df_module_name = get_dataframe_module_name(df)
 
-    org_rows, org_columns, org_bytes = (
-        len(df),
-        len(df.columns),
-        nbytes(df, df_module_name),
-    )
     max_bytes_numeric = as_nbytes(max_bytes)
+    if is_polars_lazyframe(df):
+        org_rows, org_columns = shape or polars_lazyframe_shape(df)
+    else:
+        org_rows, org_columns = len(df), len(df.columns)
+
+    index_bytes = 0
+    if not max_bytes_numeric > 0:
+        # The size of the table is not needed
+        org_column_nbytes = [0] * org_columns
+        column_bytes = None
+    elif is_polars_lazyframe(df):
+        org_column_nbytes = _polars_lazyframe_column_nbytes(
+            df, org_rows, max_bytes_mode
+        )
+        column_bytes = None
+    else:
+        org_column_nbytes = column_bytes = _column_nbytes(
+            df, df_module_name, max_bytes_mode
+        )
+        index_bytes = _index_nbytes(df, df_module_name, max_bytes_mode, show_index)
+
+    if is_polars_lazyframe(df):
+        df = _collect_polars_lazyframe(
+            df,
+            plan_downsampling(
+                org_rows, org_column_nbytes, max_rows, max_columns, max_bytes_numeric
+            ),
+        )
+        # The rows and columns that were collected are measured again
+
+    org_bytes = sum(org_column_nbytes) + index_bytes
     df = _downsample(
         df,
         df_module_name,
         max_rows=max_rows,
         max_columns=max_columns,
         max_bytes=max_bytes_numeric,
+        column_bytes=column_bytes,
+        max_bytes_mode=max_bytes_mode,
+        index_bytes=index_bytes,
+        show_index=show_index,
     )
 
     if len(df) < org_rows or len(df.columns) < org_columns:
@@ -86,6 +247,58 @@ def downsample(
     return df, ""
 
 
+def is_polars_lazyframe(df: DataFrameOrSeries) -> bool:
+    return (
+        get_dataframe_module_name(df) == "polars" and type(df).__name__ == "LazyFrame"
+    )
+
+
+def polars_lazyframe_shape(lf) -> tuple[int, int]:
+    """Return the number of rows and columns of a Polars LazyFrame"""
+    import polars as pl
+
+    rows = lf.select(pl.len()).collect().item()
+    return rows, len(lf.collect_schema())
+
+
+"""The number of rows (taken at the top and bottom of a Polars LazyFrame)
+that are collected to estimate the size of its columns"""
+LAZYFRAME_SAMPLE_ROWS = 200
+
+
+def _polars_lazyframe_column_nbytes(
+    lf, rows: int, max_bytes_mode: Literal["memory", "serialized"]
+) -> list[int]:
+    """Estimate the size of the columns of a LazyFrame from its first and last rows"""
+    sample_rows = min(rows, LAZYFRAME_SAMPLE_ROWS)
+    sample = _collect_polars_lazyframe(lf, (sample_rows, len(lf.collect_schema())))
+    sample_bytes = _column_nbytes(sample, "polars", max_bytes_mode)
+    if not sample_rows:
+        return sample_bytes
+    return [int(b * rows / sample_rows) for b in sample_bytes]
+
+
+def _collect_polars_lazyframe(lf, shape: Optional[tuple[int, int]]):
+    """Collect the first and last rows and columns of a LazyFrame, or a single
+    cell with "..." when shape is None"""
+    import polars as pl
+
+    names = lf.collect_schema().names()
+    if shape is None:
+        # max_bytes is smaller than the average size of one cell
+        return pl.DataFrame({names[0]: ["..."]})
+
+    rows, columns = shape
+    first_columns, last_columns = _first_and_last(columns)
+    lf = lf.select(names[:first_columns] + names[len(names) - last_columns :])
+    first_rows, last_rows = _first_and_last(rows)
+    if not last_rows:
+        return lf.head(first_rows).collect()
+    # The head and tail are collected separately: in a single query, the
+    # common subplan would be cached, and so evaluated on all the rows
+    return pl.concat([lf.head(first_rows).collect(), lf.tail(last_rows).collect()])
+
+
 def shrink_towards_target_aspect_ratio(
     rows: int, columns: int, shrink_factor: float, target_aspect_ratio: float
 ) -> tuple[int, int]:
@@ -115,43 +328,52 @@ def shrink_towards_target_aspect_ratio(
     return int(rows * row_shrink_factor), int(columns * column_shrink_factor)
 
 
-def _downsample(
-    df,
-    df_module_name: DataFrameModuleName,
-    max_rows=0,
-    max_columns=0,
-    max_bytes=0,
-    target_aspect_ratio=None,
-):
-    """Implementation of downsample - may be called recursively"""
-    if len(df) > max_rows > 0:
-        second_half = max_rows // 2
-        first_half = max_rows - second_half
-        assert first_half >= second_half
-        rows = list(range(first_half)) + list(range(len(df) - second_half, len(df)))
-        if df_module_name == "pandas":
-            df = df.iloc[rows]
-        elif df_module_name == "polars":
-            df = df[rows]
-        else:
-            raise TypeError(f"Unsupported DataFrame type: {df_module_name}")
-
-    if len(df.columns) > max_columns > 0:
-        second_half = max_columns // 2
-        first_half = max_columns - second_half
-        assert first_half >= second_half
-        columns = list(range(first_half)) + list(
-            range(len(df.columns) - second_half, len(df.columns))
+def _first_and_last(max_count: int) -> tuple[int, int]:
+    """Return how many of the first and last items we keep to show max_count items"""
+    second_half = max_count // 2
+    first_half = max_count - second_half
+    assert first_half >= second_half
+    return first_half, second_half
+
+
+def plan_downsampling(
+    rows: int,
+    column_bytes: list[float],
+    max_rows: int = 0,
+    max_columns: int = 0,
+    max_bytes: int = 0,
+    target_aspect_ratio: Optional[float] = None,
+    index_bytes: float = 0,
+) -> Optional[tuple[int, int]]:
+    """Return the number of rows and columns that fit the limits, given the
+    number of bytes used by each column of the table (and by the index
+    columns, which are never dropped), or None if max_bytes is
+    smaller than the average size of one cell.
+
+    The successive shrinking steps are computed on the estimated size of
+    the first and last rows and columns, without slicing the table."""
+    columns = len(column_bytes)
+    # The size of one row for the first and last columns
+    row_bytes = [b / rows if rows else 0.0 for b in column_bytes]
+    index_row_bytes = index_bytes / rows if rows else 0.0
+    first_columns_row_bytes = [0.0, *itertools.accumulate(row_bytes)]
+    last_columns_row_bytes = [0.0, *itertools.accumulate(reversed(row_bytes))]
+
+    while True:
+        if rows > max_rows > 0:
+            rows = max_rows
+        if columns > max_columns > 0:
+            columns = max_columns
+
+        first_columns, last_columns = _first_and_last(columns)
+        estimated_bytes = rows * (
+            index_row_bytes
+            + first_columns_row_bytes[first_columns]
+            + last_columns_row_bytes[last_columns]
         )
-        if df_module_name == "pandas":
-            df = df.iloc[:, columns]
-        elif df_module_name == "polars":
-            df = df[[df.columns[i] for i in columns]]
-        else:
-            raise TypeError(f"Unsupported DataFrame type: {df_module_name}")
+        if not estimated_bytes > max_bytes > 0:
+            return rows, columns
 
-    df_nbytes = nbytes(df, df_module_name)
-    if df_nbytes > max_bytes > 0:
         if target_aspect_ratio is None:
             if max_rows > 0 and max_columns > 0:
                 target_aspect_ratio = max_rows / float(max_columns)
@@ -159,24 +381,144 @@ def _downsample(
                 target_aspect_ratio = 1.0
 
         max_rows, max_columns = shrink_towards_target_aspect_ratio(
-            len(df),
-            len(df.columns),
-            shrink_factor=max_bytes / float(df_nbytes),
+            rows,
+            columns,
+            shrink_factor=max_bytes / float(estimated_bytes),
             target_aspect_ratio=target_aspect_ratio,
         )
 
-        if max_rows > 0 and max_columns > 0:
-            return _downsample(
-                df,
-                df_module_name,
-                max_rows,
-                max_columns,
-                max_bytes,
-                target_aspect_ratio,
+        if not (max_rows > 0 and max_columns > 0):
+            return None
+
+
+def _head_and_tail(df, df_module_name: DataFrameModuleName, rows: int, columns: int):
+    """Return the first and last rows and columns of the table"""
+    first_columns, last_columns = _first_and_last(columns)
+    first_rows, last_rows = _first_and_last(rows)
+    if df_module_name == "pandas":
+        import pandas as pd
+
+        if columns < len(df.columns):
+            df = pd.concat(
+                [
+                    df.iloc[:, :first_columns],
+                    df.iloc[:, len(df.columns) - last_columns :],
+                ],
+                axis=1,
+            )
+        if rows < len(df):
+            df = pd.concat([df.iloc[:first_rows], df.iloc[len(df) - last_rows :]])
+    elif df_module_name == "polars":
+        import polars as pl
+
+        if columns < len(df.columns):
+            df = df.select(
+                df.columns[:first_columns]
+                + df.columns[len(df.columns) - last_columns :]
             )
+        if rows < len(df):
+            df = pl.concat([df.head(first_rows), df.tail(last_rows)])
+    else:
+        # Other DataFrames are handled via Narwhals
+        import narwhals as nw
+
+        nw_df = nw.from_native(df, eager_only=True)
+        if columns < len(nw_df.columns):
+            nw_df = nw_df.select(
+                nw_df.columns[:first_columns]
+                + nw_df.columns[len(nw_df.columns) - last_columns :]
+            )
+        if rows < len(nw_df):
+            nw_df = nw.concat([nw_df.head(first_rows), nw_df.tail(last_rows)])
+        df = nw_df if isinstance(df, nw.DataFrame) else nw_df.to_native()
+    return df
+
+
+def _single_cell(df, df_module_name: DataFrameModuleName):
+    """Return a table of the same type as df, with a single cell "..." """
+    if df_module_name in ["pandas", "polars"]:
+        return type(df)({df.columns[0]: ["..."]})
+    # Other DataFrames are handled via Narwhals
+    import narwhals as nw
+
+    nw_df = nw.from_native(df, eager_only=True)
+    cell = nw.from_dict({nw_df.columns[0]: ["..."]}, backend=nw_df.implementation)
+    return cell if isinstance(df, nw.DataFrame) else cell.to_native()
 
+
+def _downsample(
+    df,
+    df_module_name: DataFrameModuleName,
+    max_rows=0,
+    max_columns=0,
+    max_bytes=0,
+    target_aspect_ratio=None,
+    column_bytes: Optional[list[int]] = None,
+    max_bytes_mode: Literal["memory", "serialized"] = "memory",
+    index_bytes: Optional[int] = None,
+    show_index: bool = False,
+):
+    """Implementation of downsample: the table is sliced to max_rows and
+    max_columns, and then (at most) once more, at the size returned by
+    plan_downsampling for max_bytes"""
+    if len(df) > max_rows > 0 or len(df.columns) > max_columns > 0:
+        df = _head_and_tail(
+            df,
+            df_module_name,
+            min(len(df), max_rows or len(df)),
+            min(len(df.columns), max_columns or len(df.columns)),
+        )
+        # The first and last rows might be smaller (or larger) than the average
+        column_bytes = index_bytes = None
+
+    if not max_bytes > 0:
+        return df
+
+    if column_bytes is None:
+        column_bytes = _column_nbytes(df, df_module_name, max_bytes_mode)
+    if index_bytes is None:
+        index_bytes = _index_nbytes(df, df_module_name, max_bytes_mode, show_index)
+
+    if target_aspect_ratio is None:
+        if max_rows > 0 and max_columns > 0:
+            target_aspect_ratio = max_rows / float(max_columns)
+        else:
+            target_aspect_ratio = 1.0
+
+    shape = plan_downsampling(
+        len(df),
+        column_bytes,
+        max_rows,
+        max_columns,
+        max_bytes,
+        target_aspect_ratio,
+        index_bytes,
+    )
+    if shape is None:
         # max_bytes is smaller than the average size of one cell
         # return a single cell with "..."
-        return type(df)({df.columns[0]: ["..."]})
+        return _single_cell(df, df_module_name)
+
+    rows, columns = shape
+    if rows == len(df) and columns == len(df.columns):
+        return df
 
+    df = _head_and_tail(df, df_module_name, rows, columns)
+    if (
+        sum(_column_nbytes(df, df_module_name, max_bytes_mode))
+        + _index_nbytes(df, df_module_name, max_bytes_mode, show_index)
+        > max_bytes
+    ):
+        # The size of the columns is not exactly proportional to the number
+        # of rows (e.g. for strings in Polars), so we shrink the result again
+        return _downsample(
+            df,
+            df_module_name,
+            max_rows,
+            max_columns,
+            max_bytes,
+            target_aspect_ratio,
+            max_bytes_mode=max_bytes_mode,
+            show_index=show_index,
+        )
     return df
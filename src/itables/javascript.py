@@ -1,5 +1,6 @@
 """HTML/js representation of Pandas dataframes"""
 
+import datetime
 import json
 import re
 import sys
@@ -8,17 +9,44 @@ import warnings
 from base64 import b64encode
 from importlib.util import find_spec
 from pathlib import Path
-from typing import Any, Literal, Mapping, Optional, Sequence, Union, cast
+from typing import (
+    Any,
+    Iterator,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Union,
+    cast,
+)
 
 import itables.options as opt
 
 from .datatables_format import (
+    _NON_FINITE_FLOAT_DISPLAY,
+    DICTIONARY_ENCODING_MAX_CARDINALITY_RATIO,
+    DICTIONARY_ENCODING_MIN_ROWS,
+    _column_as_list,
     _narwhals_categories,
     _polars_categories,
+    compress_data_json,
     datatables_rows,
+    decompress_data_json,
+    dictionary_encode_column,
+    encode_columns,
     escape_html_chars,
+    format_columns,
+    get_json_encoder_backend,
+    iter_compressed_data_json,
+    iter_encoded_columns,
+    pandas_datetime_epochs,
+    polars_datetime_epochs,
+    scale_float_column,
+    string_column_dictionary,
 )
-from .downsample import downsample
+from .downsample import downsample, is_polars_lazyframe, polars_lazyframe_shape
+from .server_side import ServerSideTable
 from .typing import (
     DataFrameModuleName,
     DataFrameOrSeries,
@@ -53,9 +81,19 @@ _OPTIONS_NOT_AVAILABLE_IN_APP_MODE = {
     "display_logo_when_loading",
 }
 _OPTIONS_NOT_AVAILABLE_WITH_TO_HTML = {
+    "server_side_url",
+    "server_side_engine",
+    "data_json_orient",
+    "compress_data",
+    "json_encoder",
+    "dictionary_encoding",
+    "compact_floats",
+    "datetime_encoding",
+    "formatting_workers",
     "footer",
     "column_filters",
     "maxBytes",
+    "maxBytes_mode",
     "maxRows",
     "maxColumns",
     "warn_on_unexpected_types",
@@ -412,23 +450,55 @@ def to_html_datatable(
     Return the HTML representation of the given
     dataframe as an interactive datatable
     """
+    return "".join(_iter_html_datatable(df, caption, False, **kwargs))
+
+
+def write_html_datatable(
+    df: DataFrameOrSeries,
+    file: TextIO,
+    caption: Optional[str] = None,
+    **kwargs: Unpack[ITableOptions],
+) -> None:
+    """
+    Write the HTML representation of the given dataframe as an interactive
+    datatable to a file-like object. This gives the same output as
+    to_html_datatable, but the table data is encoded and written in chunks
+    rather than as a single string, which reduces the peak memory usage
+    on large tables.
+    """
+    for html in _iter_html_datatable(df, caption, True, **kwargs):
+        file.write(html)
+
+
+def _iter_html_datatable(
+    df: DataFrameOrSeries,
+    caption: Optional[str],
+    stream_data_json: bool,
+    **kwargs: Unpack[ITableOptions],
+) -> Iterator[str]:
     kwargs["table_id"] = table_id = check_table_id(
         kwargs.pop("table_id", None), kwargs, df=df
     )
-    dt_args = get_itable_arguments(df, caption, **kwargs)
+    json_encoder = kwargs.get("json_encoder", opt.json_encoder)
+    dt_args = _get_itable_arguments(df, caption, False, stream_data_json, **kwargs)
     dt_url = dt_args.pop("dt_url")
     connected = dt_args.pop("connected")
     display_logo_when_loading = dt_args.pop("display_logo_when_loading", False)
 
+    # The streamed data_json is not a string (yet)
+    data_json = dt_args.pop("data_json", None)
     check_itable_arguments(cast(dict[str, Any], dt_args), DTForITablesOptions)
+    if data_json is not None:
+        dt_args["data_json"] = data_json
     fallback_html = _simple_html_table_from_dt_args(dt_args, include_trust_hint=True)
-    return html_table_from_template(
+    return iter_html_table_from_template(
         table_id=table_id,
         dt_url=dt_url,
         connected=connected,
         display_logo_when_loading=display_logo_when_loading,
         kwargs=dt_args,
         fallback_html=fallback_html,
+        json_encoder=json_encoder,
     )
 
 
@@ -481,6 +551,15 @@ _FLOAT_SORT_PAIR_RENDER = (
 # cf. get_categorical_columns_to_be_represented_through_their_rank(): the
 # categories are embedded in the function body as a JSON array
 _CATEGORY_RENDER_RE = re.compile(r"var categories = (.*); return type")
+# The 'render' function generated for dictionary-encoded string columns,
+# cf. get_string_columns_to_be_dictionary_encoded()
+_DICTIONARY_RENDER_RE = re.compile(r"var values = (.*); return function")
+# The 'render' function generated for float columns sent as scaled integers,
+# cf. compact_floats
+_SCALED_FLOAT_RENDER_RE = re.compile(r"var precision = ([0-9]+);")
+# The 'render' function generated for datetime columns sent as epochs,
+# cf. datetime_encoding
+_EPOCH_DATETIME_RENDER_RE = re.compile(r"var format = (\{.*?\});")
 _NON_FINITE_FLOAT_SENTINELS = {
     "___NaN___": "NaN",
     "___Infinity___": "Infinity",
@@ -580,13 +659,18 @@ def _header_labels_from_table_html(table_html: str) -> "list[str]":
 
 def _float_and_category_targets_from_column_defs(
     columnDefs: Optional[Sequence[Mapping[str, Any]]],
-) -> "tuple[set[int], dict[int, list]]":
+) -> "tuple[set[int], dict[int, list], dict[int, int], dict[int, dict[str, Any]]]":
     """Recover, from the columnDefs generated by get_itable_arguments(), which
-    columns are float columns encoded as [display, sort] pairs, and which
-    columns are categorical columns encoded as a 1-based rank (0 = missing),
-    together with their ordered list of categories."""
+    columns are float columns encoded as [display, sort] pairs, which
+    columns are categorical (or dictionary-encoded string) columns encoded as
+    a 1-based rank (0 = missing), together with their ordered list of categories,
+    which columns are float columns sent as scaled integers, together with
+    their precision, and which columns are datetime columns sent as epochs,
+    together with their format."""
     float_targets: set[int] = set()
     category_targets: dict[int, list] = {}
+    scaled_float_targets: dict[int, int] = {}
+    datetime_targets: dict[int, dict[str, Any]] = {}
     for col_def in columnDefs or []:
         targets = col_def.get("targets")
         target_list = cast(
@@ -596,19 +680,40 @@ def _float_and_category_targets_from_column_defs(
         if render == _FLOAT_SORT_PAIR_RENDER:
             float_targets.update(target_list)
             continue
+        match = _SCALED_FLOAT_RENDER_RE.search(render)
+        if match:
+            for target in target_list:
+                scaled_float_targets[target] = int(match.group(1))
+            continue
+        match = _EPOCH_DATETIME_RENDER_RE.search(render)
+        if match:
+            for target in target_list:
+                datetime_targets[target] = json.loads(match.group(1))
+            continue
         match = _CATEGORY_RENDER_RE.search(render)
+        if match is None:
+            match = _DICTIONARY_RENDER_RE.search(render)
         if match:
             categories = json.loads(match.group(1))
             for target in target_list:
                 category_targets[target] = categories
-    return float_targets, category_targets
+    return float_targets, category_targets, scaled_float_targets, datetime_targets
 
 
 def _decode_cell_for_markdown(
-    value: Any, *, is_float: bool, categories: Optional[list]
+    value: Any,
+    *,
+    is_float: bool,
+    categories: Optional[list],
+    scaled_float_precision: Optional[int] = None,
+    datetime_format: Optional[Mapping[str, Any]] = None,
 ) -> str:
     """Turn one data_json cell (as produced by get_itable_arguments(), see
     datatables_rows()) into a plain-text value for the Markdown table."""
+    if scaled_float_precision is not None:
+        return _display_scaled_float(value, scaled_float_precision)
+    if datetime_format is not None:
+        return _display_epoch_datetime(value, datetime_format)
     if is_float:
         # [display_string, sort_value] pair, cf. _FLOAT_SORT_PAIR_RENDER above
         display_value = None if value is None else value[0]
@@ -623,6 +728,115 @@ def _decode_cell_for_markdown(
     return str(value)
 
 
+def _display_scaled_float(value: Any, precision: int) -> str:
+    """The Python equivalent of _scaled_float_render()"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return _NON_FINITE_FLOAT_DISPLAY[value]
+    digits = str(abs(value)).rjust(precision + 1, "0")
+    if precision:
+        digits = f"{digits[:-precision]}.{digits[-precision:]}"
+    return f"-{digits}" if value < 0 else digits
+
+
+def _scaled_float_render(precision: int) -> JavascriptFunction:
+    """The 'render' function for float columns sent as integers
+    scaled by 10^precision, cf. scale_float_column"""
+    return JavascriptFunction(
+        f"function (data, type, row, meta) {{ var precision = {precision}; "
+        "if (type === 'sort' || type === 'type' || data === null) return data; "
+        "if (Number.isNaN(data)) return 'NaN'; "
+        "if (!Number.isFinite(data)) return data > 0 ? 'inf' : '-inf'; "
+        "var digits = Math.abs(data).toString().padStart(precision + 1, '0'); "
+        "if (precision) digits = digits.slice(0, -precision) + '.' + digits.slice(-precision); "
+        "return data < 0 ? '-' + digits : digits; }"
+    )
+
+
+def _display_epoch_datetime(value: Any, datetime_format: Mapping[str, Any]) -> str:
+    """The Python equivalent of _epoch_datetime_render()"""
+    if value is None:
+        return datetime_format["null"]
+    scale = 1 if datetime_format["unit"] == "us" else 1000
+    timestamp = datetime.datetime(1970, 1, 1) + datetime.timedelta(
+        microseconds=value * scale
+    )
+    if datetime_format["date_only"]:
+        return timestamp.strftime("%Y-%m-%d")
+    digits = f"{timestamp.microsecond:06d}"
+    fraction = datetime_format["fraction"]
+    if fraction == "auto":
+        fraction = 0 if digits == "000000" else 3 if digits.endswith("000") else 6
+    text = f"{timestamp.year:04d}-{timestamp:%m-%d %H:%M:%S}"
+    return f"{text}.{digits[:fraction]}" if fraction else text
+
+
+def _epoch_datetime_render(datetime_format: Mapping[str, Any]) -> JavascriptFunction:
+    """The 'render' function for datetime columns sent as milliseconds or
+    microseconds since the epoch, cf. pandas_datetime_epochs and
+    polars_datetime_epochs"""
+    return JavascriptFunction(
+        f"function (data, type, row, meta) {{ var format = {json.dumps(datetime_format)}; "
+        "if (type === 'sort' || type === 'type') return data; "
+        "if (data === null) return format.null; "
+        "var scale = format.unit === 'us' ? 1000 : 1; "
+        "var ms = Math.floor(data / scale); "
+        "var iso = new Date(ms).toISOString(); "
+        "if (format.date_only) return iso.slice(0, 10); "
+        "var digits = iso.slice(20, 23) + (scale === 1000 ? String(data - ms * scale).padStart(3, '0') : '000'); "
+        "var n = format.fraction === 'auto' ? (digits === '000000' ? 0 : digits.endsWith('000') ? 3 : 6) : format.fraction; "
+        "return iso.slice(0, 10) + ' ' + iso.slice(11, 19) + (n ? '.' + digits.slice(0, n) : ''); }"
+    )
+
+
+def _float_pair_column_def(targets: list[int]) -> dict[str, Any]:
+    """The float columns formatted in Python are sent as [display, value] pairs"""
+    return {
+        "targets": targets,
+        "render": JavascriptFunction(_FLOAT_SORT_PAIR_RENDER),
+    }
+
+
+class _StreamedDataJson:
+    """The table data, formatted but not yet encoded to JSON: data_json is
+    produced either at once by to_json(), or in chunks when iterated over.
+    With compress=True, data_json is compressed with gzip and encoded in base64"""
+
+    def __init__(
+        self,
+        formatted_columns: Sequence[Sequence[Any]],
+        *,
+        row_count: int,
+        compress: bool = False,
+        **encoding_options: Any,
+    ):
+        self.formatted_columns = formatted_columns
+        self.row_count = row_count
+        self.compress = compress
+        self.encoding_options = encoding_options
+
+    def to_json(self) -> str:
+        data_json = encode_columns(
+            self.formatted_columns, row_count=self.row_count, **self.encoding_options
+        )
+        return compress_data_json(data_json) if self.compress else data_json
+
+    def __iter__(self) -> Iterator[str]:
+        chunks = iter_encoded_columns(
+            self.formatted_columns, row_count=self.row_count, **self.encoding_options
+        )
+        return iter_compressed_data_json(chunks) if self.compress else chunks
+
+    def head(self, n: int) -> str:
+        """The data_json for the first n rows only, row by row"""
+        return encode_columns(
+            [_column_as_list(x)[:n] for x in self.formatted_columns],
+            row_count=min(n, self.row_count),
+            **{**self.encoding_options, "orient": "rows"},
+        )
+
+
 def _decoded_rows(dt_args: DTForITablesOptions) -> "tuple[list[list[str]], int]":
     """Decode dt_args['data_json'] into plain-text rows, truncated to the
     pagination row count. Returns (rows, hidden_row_count), where
@@ -630,24 +844,38 @@ def _decoded_rows(dt_args: DTForITablesOptions) -> "tuple[list[list[str]], int]"
     the original dataframe - both the ones downsampling already dropped
     from data_json (filtered_row_count) and the ones pagination hides on
     top of that."""
-    float_targets, category_targets = _float_and_category_targets_from_column_defs(
-        dt_args.get("columnDefs")
+    float_targets, category_targets, scaled_float_targets, datetime_targets = (
+        _float_and_category_targets_from_column_defs(dt_args.get("columnDefs"))
     )
-    all_rows = json.loads(cast(str, dt_args.get("data_json")))
+    rows_to_show = _rows_per_page(dt_args)
+    data_json = dt_args.get("data_json")
+    if isinstance(data_json, _StreamedDataJson):
+        # We only encode the rows that are shown
+        total_rows = data_json.row_count
+        all_rows = json.loads(
+            data_json.head(total_rows if rows_to_show is None else rows_to_show)
+        )
+    else:
+        if dt_args.get("data_json_compression") == "gzip":
+            data_json = decompress_data_json(cast(str, data_json))
+        all_rows = json.loads(cast(str, data_json))
+        if dt_args.get("data_json_orient") == "columns":
+            all_rows = [list(row) for row in zip(*all_rows)]
+        total_rows = len(all_rows)
     text_rows = [
         [
             _decode_cell_for_markdown(
                 cell,
                 is_float=i in float_targets,
                 categories=category_targets.get(i),
+                scaled_float_precision=scaled_float_targets.get(i),
+                datetime_format=datetime_targets.get(i),
             )
             for i, cell in enumerate(row)
         ]
         for row in all_rows
     ]
 
-    total_rows = len(text_rows)
-    rows_to_show = _rows_per_page(dt_args)
     hidden_rows = cast(int, dt_args.get("filtered_row_count", 0))
     if rows_to_show is not None and rows_to_show < total_rows:
         text_rows = text_rows[:rows_to_show]
@@ -1120,6 +1348,75 @@ def get_categorical_columns_to_be_represented_through_their_rank(
     return {k: v for k, v in categorical_columns.items() if k in keys}
 
 
+def get_string_columns_to_be_dictionary_encoded(
+    formatted_columns: Sequence[Sequence[Any]],
+    dictionary_encoding: Union[bool, Literal["auto"]],
+    columnDefs: Optional[Sequence[Mapping[str, Any]]],
+    excluded_columns: set[int],
+) -> "dict[int, list[str]]":
+    """
+    Return a dict mapping column indices to the dictionary of their distinct values,
+    for the (formatted) string columns that should be sent as integer codes.
+    """
+    if dictionary_encoding is False:
+        return {}
+
+    dictionary_encoded_columns = {}
+    for i, values in enumerate(formatted_columns):
+        if i in excluded_columns or not len(values):
+            continue
+        if dictionary_encoding == "auto" and len(values) < DICTIONARY_ENCODING_MIN_ROWS:
+            continue
+        dictionary = string_column_dictionary(values)
+        if dictionary is None:
+            continue
+        if dictionary_encoding == "auto" and len(
+            dictionary
+        ) > DICTIONARY_ENCODING_MAX_CARDINALITY_RATIO * len(values):
+            continue
+        dictionary_encoded_columns[i] = dictionary
+
+    if columnDefs is None or dictionary_encoding is True:
+        return dictionary_encoded_columns
+
+    # dictionary_encoding="auto": remove columns that have a render function defined
+    keys = set(dictionary_encoded_columns.keys())
+    _remove_columns_with_render_in_columndefs(keys, len(formatted_columns), columnDefs)
+    return {k: v for k, v in dictionary_encoded_columns.items() if k in keys}
+
+
+def get_datetime_columns_to_be_sent_as_epochs(
+    df_module_name: DataFrameModuleName,
+    df: DataFrameOrSeries,
+    datetime_encoding: Literal["text", "epoch"],
+    columnDefs: Optional[Sequence[Mapping[str, Any]]],
+) -> "dict[int, tuple[list[Any], dict[str, Any]]]":
+    """
+    Return a dict mapping column indices to the epochs of their values and to their
+    display format, for the datetime columns that should be sent as integers.
+    """
+    if datetime_encoding == "text":
+        return {}
+    if datetime_encoding != "epoch":
+        raise ValueError(
+            f"datetime_encoding should be 'text' or 'epoch', not {datetime_encoding!r}"
+        )
+
+    if df_module_name in ["pandas", "numpy"]:
+        epochs = {i: pandas_datetime_epochs(x) for i, (_, x) in enumerate(df.items())}
+    elif df_module_name == "polars":
+        epochs = {i: polars_datetime_epochs(x) for i, x in enumerate(df.get_columns())}
+    else:
+        # Other dataframes are formatted by Narwhals, and their datetimes
+        # are sent as text
+        return {}
+
+    datetime_columns = {i: e for i, e in epochs.items() if e is not None}
+    keys = set(datetime_columns.keys())
+    _remove_columns_with_render_in_columndefs(keys, len(df.columns), columnDefs or [])
+    return {k: v for k, v in datetime_columns.items() if k in keys}
+
+
 def get_itable_arguments(
     df: DataFrameOrSeries,
     caption: Optional[str] = None,
@@ -1129,6 +1426,24 @@ def get_itable_arguments(
     """
     Return the arguments to be passed to the ITable class
     """
+    return _get_itable_arguments(df, caption, app_mode, False, **kwargs)
+
+
+def _get_itable_arguments(
+    df: DataFrameOrSeries,
+    caption: Optional[str],
+    app_mode: bool,
+    stream_data_json: bool,
+    server_side: bool = False,
+    **kwargs: Unpack[ITableOptions],
+) -> DTForITablesOptions:
+    """
+    Return the arguments to be passed to the ITable class. With stream_data_json=True,
+    data_json is a _StreamedDataJson object that encodes the data when iterated over.
+    With server_side=True, there is no data_json: the table is not downsampled, and
+    its rows are formatted on request by the ServerSideTable in server_side_table.
+    With the server_side_url option, DataTables requests the rows from that URL.
+    """
     if "import_jquery" in kwargs:
         raise TypeError(
             "The argument 'import_jquery' was removed in ITables v2.0. "
@@ -1152,6 +1467,12 @@ def get_itable_arguments(
     else:
         use_to_html = kwargs.pop("use_to_html", False)
 
+    if server_side and use_to_html:
+        raise ValueError(
+            "Server-side processing is not available with use_to_html=True "
+            "(e.g. for Pandas Styler objects)"
+        )
+
     set_default_options(kwargs, use_to_html=use_to_html, app_mode=app_mode)
 
     showIndex = kwargs.pop("showIndex")
@@ -1171,6 +1492,7 @@ def get_itable_arguments(
     show_df_type = kwargs.pop("show_df_type", False)
 
     maxBytes = kwargs.pop("maxBytes", 0)
+    maxBytes_mode = kwargs.pop("maxBytes_mode", "memory")
     maxRows = kwargs.pop("maxRows", 0)
 
     if "maxColumns" in kwargs:
@@ -1214,6 +1536,15 @@ def get_itable_arguments(
     footer = kwargs.pop("footer", False)
     format_floats_in_python = kwargs.pop("format_floats_in_python", "auto")
     add_rank_to_categories = kwargs.pop("add_rank_to_categories", "auto")
+    dictionary_encoding = kwargs.pop("dictionary_encoding", False)
+    compact_floats = kwargs.pop("compact_floats", False)
+    datetime_encoding = kwargs.pop("datetime_encoding", "text")
+    data_json_orient = kwargs.pop("data_json_orient", "rows")
+    compress_data = kwargs.pop("compress_data", False)
+    json_encoder = kwargs.pop("json_encoder", "auto")
+    formatting_workers = kwargs.pop("formatting_workers", 0)
+    server_side_url = kwargs.pop("server_side_url", None)
+    server_side_engine = kwargs.pop("server_side_engine", "dataframe")
     warn_on_selected_rows_not_rendered = kwargs.pop(
         "warn_on_selected_rows_not_rendered", False
     )
@@ -1226,17 +1557,82 @@ def get_itable_arguments(
         dt_args["caption"] = caption
     del kwargs
 
+    # The number of rows in the table, when it is known (it requires
+    # a query for a Polars LazyFrame)
+    row_count: Optional[int] = None
     if df is None:
         pass
+    elif server_side or server_side_url is not None:
+        if dt_args.pop("selected_rows", None):
+            raise ValueError(
+                "Row selection is not available with server-side processing"
+            )
+        # The rows of a Polars LazyFrame are collected page by page,
+        # and its header only requires its schema
+        header_df = df.head(0).collect() if is_polars_lazyframe(df) else df
+
+        if dt_args.get("column_filters", False) == "footer":
+            footer = True
+
+        table_header = _table_header(
+            header_df,
+            df_module_name,
+            showIndex,
+            footer,
+            dt_args.get("column_filters", False),
+            escape_html=allow_html is not True,
+            show_dtypes=show_dtypes,
+        )
+        column_count = _column_count_in_header(table_header)
+        dt_args["table_html"] = table_header
+        columnDefs = _check_column_defs(dt_args.get("columnDefs") or [])
+        # The float columns are identified by their dtype only
+        columns_df = safe_reset_index(df.head(0)) if showIndex else header_df
+        float_columns_to_be_formatted_in_python = (
+            get_float_columns_to_be_formatted_in_python(
+                df_module_name, columns_df, format_floats_in_python, columnDefs
+            )
+        )
+        if server_side:
+            dt_args["server_side_table"] = ServerSideTable(  # type: ignore
+                safe_reset_index(df) if showIndex else df,
+                column_count=column_count,
+                escape_html=allow_html is not True,
+                float_columns_to_be_formatted_in_python=float_columns_to_be_formatted_in_python,
+                warn_on_unexpected_types=warn_on_unexpected_types,
+                warn_on_polars_get_fmt_not_found=warn_on_polars_get_fmt_not_found,
+                json_encoder=json_encoder,
+                formatting_workers=formatting_workers,
+                engine=server_side_engine,
+            )
+            # The row count is cached by the query engine
+            row_count = len(dt_args["server_side_table"])  # type: ignore
+        if server_side_url is not None:
+            # The pages are requested from an itables.server. The ITable class
+            # parses them with parseJSON, like data_json
+            dt_args["server_side_url"] = server_side_url
+        if float_columns_to_be_formatted_in_python:
+            col_offset = column_count - len(columns_df.columns)
+            dt_args["columnDefs"] = [
+                _float_pair_column_def(
+                    [i + col_offset for i in float_columns_to_be_formatted_in_python]
+                )
+            ] + list(columnDefs)
     elif not use_to_html:
-        full_row_count = len(df)  # type: ignore
-        full_column_count = len(df.columns)  # type: ignore
+        if is_polars_lazyframe(df):
+            full_row_count, full_column_count = polars_lazyframe_shape(df)
+        else:
+            full_row_count = len(df)  # type: ignore
+            full_column_count = len(df.columns)  # type: ignore
         df, downsampling_warning = downsample(
             df,
             df_module_name=df_module_name,
             max_rows=maxRows,
             max_columns=maxColumns,
             max_bytes=maxBytes,
+            max_bytes_mode=maxBytes_mode,
+            shape=(full_row_count, full_column_count),
+            show_index=showIndex,
         )
 
         if "selected_rows" in dt_args:
@@ -1284,28 +1680,83 @@ def get_itable_arguments(
                 df_module_name, df, add_rank_to_categories, columnDefs
             )
         )
-        dt_args["data_json"] = datatables_rows(
+        datetime_columns = get_datetime_columns_to_be_sent_as_epochs(
+            df_module_name, df, datetime_encoding, columnDefs
+        )
+        formatted_columns = format_columns(
             df,
-            column_count=column_count,
             escape_html=allow_html is not True,
             float_columns_to_be_formatted_in_python=float_columns_to_be_formatted_in_python,
             categorical_columns_to_be_represented_through_their_rank=set(
                 categorical_columns.keys()
             ),
-            warn_on_unexpected_types=warn_on_unexpected_types,
             warn_on_polars_get_fmt_not_found=warn_on_polars_get_fmt_not_found,
+            formatting_workers=formatting_workers,
+            preformatted_columns={
+                i: epochs for i, (epochs, _) in datetime_columns.items()
+            },
+        )
+        # float column index -> precision of the integers that represent them
+        scaled_float_columns: dict[int, int] = {}
+        if compact_floats:
+            for col_idx in sorted(float_columns_to_be_formatted_in_python):
+                scaled = scale_float_column(formatted_columns[col_idx])
+                if scaled is not None:
+                    formatted_columns[col_idx], scaled_float_columns[col_idx] = scaled
+        dictionary_encoded_columns = get_string_columns_to_be_dictionary_encoded(
+            formatted_columns,
+            dictionary_encoding,
+            columnDefs,
+            float_columns_to_be_formatted_in_python.union(
+                categorical_columns, datetime_columns
+            ),
+        )
+        for col_idx, dictionary in dictionary_encoded_columns.items():
+            formatted_columns[col_idx] = dictionary_encode_column(
+                formatted_columns[col_idx], dictionary
+            )
+        streamed_data_json = _StreamedDataJson(
+            formatted_columns,
+            row_count=len(df),
+            compress=compress_data,
+            column_count=column_count,
+            warn_on_unexpected_types=warn_on_unexpected_types,
+            orient=data_json_orient,
+            json_encoder=json_encoder,
         )
+        if stream_data_json:
+            dt_args["data_json"] = cast(str, streamed_data_json)
+        else:
+            dt_args["data_json"] = streamed_data_json.to_json()
+        if data_json_orient == "columns":
+            dt_args["data_json_orient"] = data_json_orient
+        if compress_data:
+            dt_args["data_json_compression"] = "gzip"
         col_offset = column_count - len(df.columns)
         extra_column_defs = []
-        if float_columns_to_be_formatted_in_python:
+        float_pair_columns = float_columns_to_be_formatted_in_python.difference(
+            scaled_float_columns
+        )
+        if float_pair_columns:
+            extra_column_defs.append(
+                _float_pair_column_def([i + col_offset for i in float_pair_columns])
+            )
+        for precision in sorted(set(scaled_float_columns.values())):
             extra_column_defs.append(
                 {
                     "targets": [
-                        i + col_offset for i in float_columns_to_be_formatted_in_python
+                        i + col_offset
+                        for i, p in sorted(scaled_float_columns.items())
+                        if p == precision
                     ],
-                    "render": JavascriptFunction(
-                        "function (data, type, row, meta) { return type === 'sort' || type === 'type' ? data[1] : data[0]; }"
-                    ),
+                    "render": _scaled_float_render(precision),
+                }
+            )
+        for col_idx, (_, datetime_format) in sorted(datetime_columns.items()):
+            extra_column_defs.append(
+                {
+                    "targets": col_idx + col_offset,
+                    "render": _epoch_datetime_render(datetime_format),
                 }
             )
         for col_idx, categories in sorted(categorical_columns.items()):
@@ -1319,6 +1770,16 @@ def get_itable_arguments(
                     ),
                 }
             )
+        for col_idx, dictionary in sorted(dictionary_encoded_columns.items()):
+            # The values are already HTML-escaped by format_columns
+            extra_column_defs.append(
+                {
+                    "targets": col_idx + col_offset,
+                    "render": JavascriptCode(
+                        f"""(function () {{ var values = {json.dumps(dictionary)}; return function (data, type, row, meta) {{ return data === 0 ? null : values[data - 1]; }}; }})()"""
+                    ),
+                }
+            )
         if extra_column_defs:
             dt_args["columnDefs"] = extra_column_defs + list(columnDefs)
     else:
@@ -1369,7 +1830,7 @@ def get_itable_arguments(
             dt_args["downsampling_warning"] = df_type_description
             dt_args["filtered_row_count"] = 0
 
-    _adjust_layout(df, dt_args)
+    _adjust_layout(df, dt_args, row_count)
 
     if dt_args.get("column_filters") is False:
         dt_args.pop("column_filters")
@@ -1401,6 +1862,7 @@ def _raise_if_javascript_code(values, context=""):
 def get_itables_extension_arguments(
     df: Optional[DataFrameOrSeries],
     caption: Optional[str] = None,
+    server_side: bool = False,
     **kwargs: Unpack[ITableOptions],
 ) -> tuple[DTForITablesOptions, dict[str, Any]]:
     """
@@ -1409,9 +1871,14 @@ def get_itables_extension_arguments(
     The first dict contains the arguments to be passed to the
     DataTable constructor, while the second one contains other
     parameters to be used outside of the constructor.
+
+    With server_side=True, the table data is not included. The
+    second dict has a 'server_side_table' entry (a ServerSideTable)
+    that formats the pages requested by DataTables.
     """
     kwargs["table_id"] = check_table_id(kwargs.get("table_id", None), kwargs, df=df)
-    dt_args = get_itable_arguments(df, caption, **kwargs, app_mode=True)
+    dt_args = _get_itable_arguments(df, caption, True, False, server_side, **kwargs)
+    server_side_table = dt_args.pop("server_side_table", None)  # type: ignore
     check_itable_arguments(cast(dict[str, Any], dt_args), DTForITablesOptions)
     other_args = {
         "classes": get_compact_classes(dt_args.pop("classes")),
@@ -1419,6 +1886,8 @@ def get_itables_extension_arguments(
         "caption": dt_args.pop("caption", None),
         "selected_rows": dt_args.pop("selected_rows", []),
     }
+    if server_side:
+        other_args["server_side_table"] = server_side_table
     return dt_args, other_args
 
 
@@ -1570,7 +2039,36 @@ def html_table_from_template(
     display_logo_when_loading: bool,
     kwargs: DTForITablesOptions,
     fallback_html: str = "",
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
 ) -> str:
+    return "".join(
+        iter_html_table_from_template(
+            table_id=table_id,
+            dt_url=dt_url,
+            connected=connected,
+            display_logo_when_loading=display_logo_when_loading,
+            kwargs=kwargs,
+            fallback_html=fallback_html,
+            json_encoder=json_encoder,
+        )
+    )
+
+
+# Stands for the data_json value in the HTML template, when data_json is streamed
+_STREAMED_DATA_JSON_PLACEHOLDER = "___streamed_data_json___"
+
+
+def iter_html_table_from_template(
+    table_id: str,
+    dt_url: str,
+    connected: bool,
+    display_logo_when_loading: bool,
+    kwargs: DTForITablesOptions,
+    fallback_html: str = "",
+    json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+) -> Iterator[str]:
+    """Yield the HTML table in pieces. When data_json is a _StreamedDataJson
+    object, the data is encoded and yielded one chunk at a time."""
     # Load the HTML template
     if connected:
         output = read_package_file("html/datatables_template.html")
@@ -1646,6 +2144,12 @@ def html_table_from_template(
         f'<table id="{table_id}"{table_hidden}>{table_body}</table>{fallback_block}',
     )
 
+    streamed_data_json = kwargs.get("data_json")
+    if isinstance(streamed_data_json, _StreamedDataJson):
+        kwargs["data_json"] = _STREAMED_DATA_JSON_PLACEHOLDER
+    else:
+        streamed_data_json = None
+
     assert "classes" in kwargs
     kwargs["classes"] = get_expanded_classes(kwargs["classes"])
     assert "style" in kwargs
@@ -1656,7 +2160,7 @@ def html_table_from_template(
     json_lines = ["{"]
     items = sorted(kwargs.items())
     for i, (key, value) in enumerate(items):
-        value_json = json.dumps(value, sort_keys=True)
+        value_json = _dumps_dt_arg(value, json_encoder)
         comma = "," if i < len(items) - 1 else ""
         json_lines.append(f'  "{key}": {value_json}{comma}')
     json_lines.append("}")
@@ -1671,7 +2175,30 @@ def html_table_from_template(
         output, "let dt_args = {};", f"let dt_args = {dt_args_formatted};"
     )
 
-    return output
+    if streamed_data_json is None:
+        yield output
+        return
+
+    head, tail = output.split(f'"{_STREAMED_DATA_JSON_PLACEHOLDER}"')
+    yield head + '"'
+    for chunk in streamed_data_json:
+        # data_json is itself a JSON string in dt_args. Since JSON escapes
+        # the characters of a string one at a time, the chunks can be
+        # escaped independently.
+        yield _dumps_dt_arg(chunk, json_encoder)[1:-1]
+    yield '"' + tail
+
+
+def _dumps_dt_arg(value: Any, json_encoder: Literal["auto", "stdlib", "orjson"]) -> str:
+    """Encode one of the DataTable arguments, e.g. data_json, for the HTML template"""
+    if get_json_encoder_backend(json_encoder) == "orjson":
+        import orjson
+
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value, sort_keys=True)
 
 
 def _column_count_in_header(table_header):
@@ -1691,10 +2218,10 @@ def _min_rows(kwargs):
     return min_rows[0]
 
 
-def _adjust_layout(df, kwargs):
+def _adjust_layout(df, kwargs, row_count: Optional[int] = None):
     has_default_layout = kwargs["layout"] == DEFAULT_LAYOUT
 
-    if has_default_layout and _df_fits_in_one_page(df, kwargs):
+    if has_default_layout and _df_fits_in_one_page(df, kwargs, row_count):
         kwargs["layout"] = {
             key: _filter_control(control, kwargs.get("downsampling_warning", ""))
             for key, control in kwargs["layout"].items()
@@ -1708,10 +2235,15 @@ def _adjust_layout(df, kwargs):
         kwargs["layout"] = {**kwargs["layout"], "topStart": "buttons"}
 
 
-def _df_fits_in_one_page(df, kwargs):
-    """Display just the table (not the search box, etc...) if the rows fit on one 'page'"""
+def _df_fits_in_one_page(df, kwargs, row_count: Optional[int] = None):
+    """Display just the table (not the search box, etc...) if the rows fit on one 'page'.
+    The row_count, when known, is used rather than the length of df"""
     if df is None:
         return True
+    if row_count is not None:
+        return row_count <= _min_rows(kwargs)
+    if is_polars_lazyframe(df):
+        return polars_lazyframe_shape(df)[0] <= _min_rows(kwargs)
     try:
         # Pandas DF or Style
         return len(df.index) <= _min_rows(kwargs)
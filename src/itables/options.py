@@ -79,6 +79,11 @@ css: str = ""
 """Maximum bytes before downsampling a table"""
 maxBytes: Union[str, int] = "64KB"
 
+"""What maxBytes is compared to: "memory" is the memory used by the dataframe,
+and "serialized" is an estimate of the size of the table data in the HTML
+output, obtained by formatting and encoding a sample of the rows"""
+maxBytes_mode: Literal["memory", "serialized"] = "memory"
+
 """Maximum number of rows or columns before downsampling a table"""
 maxRows: int = 0
 maxColumns: int = 200
@@ -104,6 +109,51 @@ option. Set to False to sort categories alphabetically by DataTables.
 """
 add_rank_to_categories: Union[bool, Literal["auto"]] = "auto"
 
+"""Send the string columns as integer codes into the list of their distinct values,
+which are resolved in the browser by a 'render' function. In mode "auto", only
+the columns with at least 1,000 rows and a low cardinality (at most one distinct
+value every ten rows), and no render function in columnDefs, are encoded.
+This is off by default, as the Javascript callbacks that read the row data
+(e.g. createdRow or rowCallback) would get the integer codes"""
+dictionary_encoding: Union[bool, Literal["auto"]] = False
+
+"""Send the float columns formatted in Python as integers, i.e. their display
+values scaled by 10^precision, rather than as [display, value] pairs. This
+only applies to the columns where all the values are displayed with the same
+number of decimals (the sort order then follows the displayed values)"""
+compact_floats: bool = False
+
+"""Send the Pandas and Polars datetime columns without a timezone as integers
+(milliseconds or microseconds since the epoch) with datetime_encoding="epoch".
+The values are formatted in the browser like in Python, and the columns are
+sorted by the integer"""
+datetime_encoding: Literal["text", "epoch"] = "text"
+
+"""How the table data is encoded in data_json: "rows" is the row-major format
+expected by DataTables, while "columns" sends one array per column, which is
+faster to encode and smaller for tall tables (the rows are reconstructed
+in the browser)"""
+data_json_orient: Literal["rows", "columns"] = "rows"
+
+"""Compress the table data with gzip (and encode it in base64) before
+embedding it in the HTML or notebook. The data is decompressed in the
+browser with DecompressionStream"""
+compress_data: bool = False
+
+"""The JSON encoder used to serialize the table data. In mode "auto", we use
+orjson when it is installed, and the json module from the standard library
+otherwise"""
+json_encoder: Literal["auto", "stdlib", "orjson"] = "auto"
+
+"""The number of threads used to format the columns of the table. Use 0 or 1
+to format the columns one after the other"""
+formatting_workers: int = 0
+
+"""The query engine that filters, sorts and pages the table in server-side
+mode: "dataframe" uses Pandas or Polars, and "duckdb" translates the DataTables
+requests to SQL, see itables.server_side.QUERY_ENGINES"""
+server_side_engine: str = "dataframe"
+
 """Authorize, or not, the use of HTML in the table content.
 
 Make sure that you trust the content of your tables before
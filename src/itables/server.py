@@ -0,0 +1,166 @@
+"""A small HTTP server that answers the DataTables server-side requests
+(https://datatables.net/manual/server-side) for one DataFrame.
+
+The server is a WSGI application, run with the wsgiref module of the
+standard library. Use serve(df) to start it in a background thread, and
+server.to_html_datatable() to get an HTML table that requests its rows from it.
+"""
+
+import json
+import threading
+from collections.abc import Iterable, Mapping
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from .javascript import _get_itable_arguments, to_html_datatable
+from .server_side import ServerSideTable
+from .typing import DataFrameOrSeries, ITableOptions, Unpack
+
+
+def parse_datatables_request(query_string: str) -> dict[str, Any]:
+    """Parse the query string of a DataTables server-side request.
+
+    DataTables encodes the request parameters like jQuery.param does, e.g.
+    'order[0][column]=1&order[0][dir]=desc': we return them as nested dicts
+    and lists, and convert 'true' and 'false' to booleans."""
+    request: dict[str, Any] = {}
+    for key, value in parse_qsl(query_string, keep_blank_values=True):
+        name, _, rest = key.partition("[")
+        path = [name] + (rest[:-1].split("][") if rest else [])
+        node = request
+        for parent in path[:-1]:
+            node = node.setdefault(parent, {})
+        node[path[-1]] = {"true": True, "false": False}.get(value, value)
+    return _dicts_with_integer_keys_to_lists(request)
+
+
+def _dicts_with_integer_keys_to_lists(node: Any) -> Any:
+    if not isinstance(node, dict):
+        return node
+    node = {
+        key: _dicts_with_integer_keys_to_lists(value) for key, value in node.items()
+    }
+    if node and all(key.isdigit() for key in node):
+        return [node[key] for key in sorted(node, key=int)]
+    return node
+
+
+def _response_json(response: Mapping[str, Any]) -> str:
+    """Encode the response of ServerSideTable.get_page. The rows are
+    already encoded in 'data_json', which we use as 'data' as is."""
+    response = dict(response)
+    data_json = response.pop("data_json", None)
+    if data_json is None:
+        return json.dumps(response)
+    return json.dumps(response)[:-1] + f', "data": {data_json}}}'
+
+
+def datatables_app(
+    table: ServerSideTable, allow_origin: Optional[str] = None
+) -> Callable[[dict[str, Any], Callable[..., Any]], Iterable[bytes]]:
+    """Return a WSGI application that answers the DataTables requests (GET
+    requests, on any path) with the pages of the table.
+
+    The 'allow_origin' value is sent as the Access-Control-Allow-Origin header.
+    It lets the tables in HTML pages or notebooks from that origin query the
+    server, e.g. 'http://localhost:8888' for Jupyter, or 'null' for local
+    HTML files. Warning: with allow_origin='*', any web page open in your
+    browser can read the full table."""
+
+    def app(
+        environ: dict[str, Any], start_response: Callable[..., Any]
+    ) -> Iterable[bytes]:
+        headers = [("Content-Type", "application/json; charset=utf-8")]
+        if allow_origin is not None:
+            headers.append(("Access-Control-Allow-Origin", allow_origin))
+        if environ.get("REQUEST_METHOD") != "GET":
+            start_response("405 Method Not Allowed", headers + [("Allow", "GET")])
+            return [b'{"error": "Only GET requests are supported"}']
+
+        request = parse_datatables_request(environ.get("QUERY_STRING", ""))
+        body = _response_json(table.get_page(request)).encode("utf-8")
+        start_response("200 OK", headers + [("Content-Length", str(len(body)))])
+        return [body]
+
+    return app
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class DataTablesServer:
+    """A DataTables server running in a background thread. Use
+    serve(df) to create one, and shutdown() to stop it."""
+
+    def __init__(
+        self,
+        df: DataFrameOrSeries,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        allow_origin: Optional[str] = None,
+        **kwargs: Unpack[ITableOptions],
+    ):
+        dt_args = _get_itable_arguments(df, None, False, False, True, **kwargs)
+        self.df = df
+        self.kwargs = kwargs
+        self.table: ServerSideTable = dt_args["server_side_table"]  # type: ignore
+        self._server: WSGIServer = make_server(
+            host,
+            port,
+            datatables_app(self.table, allow_origin),
+            handler_class=_QuietRequestHandler,
+        )
+        self.url = f"http://{host}:{self._server.server_port}/"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def to_html_datatable(
+        self, caption: Optional[str] = None, **kwargs: Unpack[ITableOptions]
+    ) -> str:
+        """Return an HTML table that requests its rows from this server"""
+        return to_html_datatable(
+            self.df,
+            caption=caption,
+            server_side_url=self.url,
+            **{**self.kwargs, **kwargs},
+        )
+
+    def shutdown(self) -> None:
+        """Stop the server"""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self) -> "DataTablesServer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.shutdown()
+
+
+def serve(
+    df: DataFrameOrSeries,
+    port: int = 0,
+    host: str = "127.0.0.1",
+    allow_origin: Optional[str] = None,
+    **kwargs: Unpack[ITableOptions],
+) -> DataTablesServer:
+    """Serve the rows of df to DataTables, in server-side mode, at
+    http://host:port/. With port=0, a free port is chosen.
+
+    The options are used to format the rows like in to_html_datatable.
+    The server runs in a background thread: use server.url to get its URL,
+    server.to_html_datatable() to get an HTML table that requests its rows
+    from it, and server.shutdown() to stop it.
+
+    By default, the browser only lets the pages served at http://host:port/
+    query the server. Pass the origin of the page that displays the table in
+    'allow_origin' (e.g. 'http://localhost:8888' in Jupyter, or 'null' for a
+    local HTML file). Warning: with allow_origin='*', any web page open in
+    your browser can read the full table."""
+    return DataTablesServer(
+        df, host=host, port=port, allow_origin=allow_origin, **kwargs
+    )
@@ -0,0 +1,535 @@
+"""Server-side processing: rather than sending all the rows to the browser,
+DataTables requests one page of the table at a time, see
+https://datatables.net/manual/server-side
+
+The table is filtered, sorted and sliced by a query engine. The default engine
+("dataframe") uses the library of the DataFrame (Pandas or Polars), and the
+"duckdb" engine translates the DataTables requests to SQL. Other engines can be
+registered in QUERY_ENGINES."""
+
+import json
+from abc import ABC, abstractmethod
+from collections.abc import Mapping, Sequence
+from typing import Any, Callable, Literal, Optional
+
+from .datatables_format import datatables_rows
+from .typing import DataFrameOrSeries, get_dataframe_module_name
+
+
+def _search_terms(search: Optional[Mapping[str, Any]]) -> list[str]:
+    """The lower case words of a DataTables search. Like in the
+    DataTables 'smart' search, a row matches the search if it
+    matches every word, in any order."""
+    if not search:
+        return []
+    return str(search.get("value") or "").lower().split()
+
+
+class QueryEngine(ABC):
+    """Filter, sort and slice a table for ServerSideTable.
+
+    'query' returns a view of the table, i.e. the rows (in the global_terms
+    and column_terms search, where every word must match) sorted by 'order'
+    (a list of column indices, and whether the order is descending).
+    The view is passed to 'count' and 'rows'.
+
+    Engines may build a search index on the first global search, and
+    keep it in 'search_index'."""
+
+    def __init__(self, df: DataFrameOrSeries):
+        self.df = df
+        self.search_index: Any = None
+
+    @abstractmethod
+    def query(
+        self,
+        global_terms: Sequence[str],
+        searchable_columns: Sequence[int],
+        column_terms: Mapping[int, Sequence[str]],
+        order: Sequence[tuple[int, bool]],
+    ) -> Any:
+        """Return a view of the table that matches the search and order"""
+
+    def row_count(self) -> int:
+        return len(self.df)
+
+    def column_count(self) -> int:
+        return len(self.df.columns)
+
+    def count(self, view: Any) -> int:
+        return len(view)
+
+    def rows(self, view: Any, start: int, stop: Optional[int]) -> DataFrameOrSeries:
+        return view[start:stop]
+
+
+class PandasQueryEngine(QueryEngine):
+    """The view is an array with the positions of the rows.
+
+    The search index is the text of each row, in lower case: the values of
+    all the columns are separated by new lines, which the search terms don't
+    contain. A global search over all the columns is then one str.contains
+    per search term."""
+
+    def __init__(self, df: DataFrameOrSeries):
+        super().__init__(df)
+        self._lowercase_text_columns: dict[int, Any] = {}
+
+    def _lowercase_text(self, j: int) -> Any:
+        """The values of the j-th column, as lower case strings"""
+        if j not in self._lowercase_text_columns:
+            self._lowercase_text_columns[j] = (
+                self.df.iloc[:, j].astype(str).str.lower().reset_index(drop=True)
+            )
+        return self._lowercase_text_columns[j]
+
+    def _get_search_index(self) -> Any:
+        if self.search_index is None:
+            columns = [
+                self.df.iloc[:, j].astype(str).str.lower().reset_index(drop=True)
+                for j in range(self.column_count())
+            ]
+            self.search_index = columns[0].str.cat(columns[1:], sep="\n")
+        return self.search_index
+
+    def query(
+        self,
+        global_terms: Sequence[str],
+        searchable_columns: Sequence[int],
+        column_terms: Mapping[int, Sequence[str]],
+        order: Sequence[tuple[int, bool]],
+    ) -> Any:
+        import numpy as np
+        import pandas as pd
+
+        mask = np.ones(len(self.df), dtype=bool)
+        if (
+            global_terms
+            and self.column_count()
+            and (sorted(searchable_columns) == list(range(self.column_count())))
+        ):
+            search_index = self._get_search_index()
+            for term in global_terms:
+                mask &= search_index.str.contains(term, regex=False).to_numpy()
+            global_terms = []
+        for term in global_terms:
+            term_mask = np.zeros(len(self.df), dtype=bool)
+            for j in searchable_columns:
+                term_mask |= (
+                    self._lowercase_text(j).str.contains(term, regex=False).to_numpy()
+                )
+            mask &= term_mask
+        for j, terms in column_terms.items():
+            for term in terms:
+                mask &= (
+                    self._lowercase_text(j).str.contains(term, regex=False).to_numpy()
+                )
+        positions = np.flatnonzero(mask)
+
+        if order:
+            keys = pd.concat(
+                [self.df.iloc[positions, j].reset_index(drop=True) for j, _ in order],
+                axis=1,
+                keys=range(len(order)),
+            )
+            sorted_index = keys.sort_values(
+                by=list(range(len(order))),
+                ascending=[not descending for _, descending in order],
+                kind="stable",
+                na_position="last",
+            ).index
+            positions = positions[sorted_index.to_numpy()]
+        return positions
+
+    def rows(self, view: Any, start: int, stop: Optional[int]) -> DataFrameOrSeries:
+        return self.df.iloc[view[start:stop]]
+
+
+def _polars_query_plan(
+    lf: Any,
+    global_terms: Sequence[str],
+    searchable_columns: Sequence[int],
+    column_terms: Mapping[int, Sequence[str]],
+    order: Sequence[tuple[int, bool]],
+) -> Any:
+    """Turn a DataTables request into a Polars LazyFrame: a filter
+    on the search terms, followed by a sort on the requested columns"""
+    import polars as pl
+
+    schema = lf.collect_schema()
+    names = schema.names()
+    dtypes = schema.dtypes()
+
+    def contains(j: int, term: str) -> "pl.Expr":
+        return (
+            pl.col(names[j])
+            .cast(pl.String)
+            .str.to_lowercase()
+            .str.contains(term, literal=True)
+            .fill_null(False)
+        )
+
+    # Nested types (lists, structs...) cannot be cast to strings
+    searchable_columns = [j for j in searchable_columns if not dtypes[j].is_nested()]
+    conditions = [
+        (
+            pl.any_horizontal([contains(j, term) for j in searchable_columns])
+            if searchable_columns
+            else pl.lit(False)
+        )
+        for term in global_terms
+    ]
+    conditions.extend(
+        contains(j, term) for j, terms in column_terms.items() for term in terms
+    )
+
+    if conditions:
+        lf = lf.filter(*conditions)
+    if order:
+        lf = lf.sort(
+            [names[j] for j, _ in order],
+            descending=[descending for _, descending in order],
+            nulls_last=True,
+            maintain_order=True,
+        )
+    return lf
+
+
+class PolarsQueryEngine(QueryEngine):
+    """The view is the filtered and sorted DataFrame.
+
+    Like for Pandas, the search index is the text of each row, in lower
+    case, with the values of the (non-nested) columns separated by new lines"""
+
+    def _text_columns(self) -> list[int]:
+        return [j for j, dtype in enumerate(self.df.dtypes) if not dtype.is_nested()]
+
+    def _get_search_index(self) -> Any:
+        import polars as pl
+
+        if self.search_index is None:
+            self.search_index = self.df.select(
+                pl.concat_str(
+                    [
+                        pl.col(self.df.columns[j])
+                        .cast(pl.String)
+                        .str.to_lowercase()
+                        .fill_null("")
+                        for j in self._text_columns()
+                    ],
+                    separator="\n",
+                )
+            ).to_series()
+        return self.search_index
+
+    def query(
+        self,
+        global_terms: Sequence[str],
+        searchable_columns: Sequence[int],
+        column_terms: Mapping[int, Sequence[str]],
+        order: Sequence[tuple[int, bool]],
+    ) -> Any:
+        import polars as pl
+
+        lf = self.df.lazy()
+        text_columns = self._text_columns()
+        if (
+            global_terms
+            and text_columns
+            and set(text_columns) <= set(searchable_columns)
+        ):
+            search_index = self._get_search_index()
+            mask = pl.repeat(True, len(self.df), eager=True)
+            for term in global_terms:
+                mask &= search_index.str.contains(term, literal=True)
+            lf = lf.filter(pl.lit(mask))
+            global_terms = []
+        return _polars_query_plan(
+            lf, global_terms, searchable_columns, column_terms, order
+        ).collect()
+
+
+class PolarsLazyQueryEngine(QueryEngine):
+    """The query engine for Polars LazyFrames (e.g. from scan_parquet).
+    The view is the query plan, and only the requested page is
+    collected: the filter can be pushed down to the scan, and the
+    sort followed by a slice runs as a top-k query."""
+
+    def __init__(self, df: DataFrameOrSeries):
+        super().__init__(df)
+        self._row_count: Optional[int] = None
+
+    def row_count(self) -> int:
+        if self._row_count is None:
+            self._row_count = self._count(self.df)
+        return self._row_count
+
+    def column_count(self) -> int:
+        return len(self.df.collect_schema())
+
+    @staticmethod
+    def _count(lf: Any) -> int:
+        import polars as pl
+
+        return lf.select(pl.len()).collect().item()
+
+    def query(
+        self,
+        global_terms: Sequence[str],
+        searchable_columns: Sequence[int],
+        column_terms: Mapping[int, Sequence[str]],
+        order: Sequence[tuple[int, bool]],
+    ) -> Any:
+        lf = _polars_query_plan(
+            self.df, global_terms, searchable_columns, column_terms, order
+        )
+        if global_terms or column_terms:
+            return lf, self._count(lf)
+        return lf, self.row_count()
+
+    def count(self, view: Any) -> int:
+        return view[1]
+
+    def rows(self, view: Any, start: int, stop: Optional[int]) -> DataFrameOrSeries:
+        lf, _ = view
+        return lf.slice(start, None if stop is None else stop - start).collect()
+
+
+def _sql_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+_DUCKDB_ROW_NUMBER = '"__itables_row_number__"'
+
+
+class DuckDBQueryEngine(QueryEngine):
+    """The table is registered in DuckDB (without a copy, for Pandas,
+    Polars and PyArrow tables), and the requests are translated to SQL,
+    with LIMIT and OFFSET for the page. The view is the WHERE and ORDER BY
+    clauses, with the number of rows that match them.
+
+    DuckDB runs the queries on several threads, and its sort is not
+    stable: the rows are also sorted by their position in the table, so
+    that the pages don't repeat or skip the rows that are equal on the
+    sort columns."""
+
+    def __init__(self, df: DataFrameOrSeries):
+        import duckdb
+
+        super().__init__(df)
+        self.df_module_name = get_dataframe_module_name(df)
+        native_df = df.to_native() if self.df_module_name == "narwhals" else df
+        self.connection = duckdb.connect()
+        self.connection.register("itables_df", native_df)
+        # The filter is not pushed below the window function,
+        # so the row numbers are the positions in the full table
+        self.connection.execute(
+            f"CREATE VIEW itables_rows AS SELECT *, "
+            f"row_number() OVER () AS {_DUCKDB_ROW_NUMBER} FROM itables_df"
+        )
+        self.columns = [
+            _sql_identifier(row[0])
+            for row in self.connection.execute("DESCRIBE itables_df").fetchall()
+        ]
+        (self._row_count,) = self.connection.execute(
+            "SELECT count(*) FROM itables_df"
+        ).fetchone()
+
+    def row_count(self) -> int:
+        return self._row_count
+
+    def column_count(self) -> int:
+        return len(self.columns)
+
+    def query(
+        self,
+        global_terms: Sequence[str],
+        searchable_columns: Sequence[int],
+        column_terms: Mapping[int, Sequence[str]],
+        order: Sequence[tuple[int, bool]],
+    ) -> Any:
+        def contains(j: int) -> str:
+            return f"coalesce(contains(lower(CAST({self.columns[j]} AS VARCHAR)), ?), false)"
+
+        conditions: list[str] = []
+        params: list[str] = []
+        for term in global_terms:
+            conditions.append(
+                "(" + " OR ".join(contains(j) for j in searchable_columns) + ")"
+                if searchable_columns
+                else "false"
+            )
+            params.extend(term for _ in searchable_columns)
+        for j, terms in column_terms.items():
+            for term in terms:
+                conditions.append(contains(j))
+                params.append(term)
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        order_by = " ORDER BY " + ", ".join(
+            [
+                f"{self.columns[j]} {'DESC' if descending else 'ASC'} NULLS LAST"
+                for j, descending in order
+            ]
+            + [_DUCKDB_ROW_NUMBER]
+        )
+        (count,) = self.connection.execute(
+            f"SELECT count(*) FROM itables_df{where}", params
+        ).fetchone()
+        return where, order_by, params, count
+
+    def count(self, view: Any) -> int:
+        return view[3]
+
+    def rows(self, view: Any, start: int, stop: Optional[int]) -> DataFrameOrSeries:
+        where, order_by, params, count = view
+        limit = count - start if stop is None else stop - start
+        result = self.connection.execute(
+            f"SELECT * EXCLUDE ({_DUCKDB_ROW_NUMBER}) "
+            f"FROM itables_rows{where}{order_by} LIMIT ? OFFSET ?",
+            params + [max(limit, 0), start],
+        )
+        if self.df_module_name == "pandas":
+            return result.df()
+        if self.df_module_name == "polars":
+            return result.pl()
+
+        import narwhals as nw
+
+        # Recent versions of DuckDB deprecate fetch_arrow_table for to_arrow_table
+        to_arrow_table = getattr(result, "to_arrow_table", result.fetch_arrow_table)
+        return nw.from_native(to_arrow_table(), eager_only=True)
+
+
+"""The query engines available for server-side processing, in addition to
+"dataframe" (the Pandas or Polars engine, depending on the DataFrame)"""
+QUERY_ENGINES: dict[str, Callable[[DataFrameOrSeries], QueryEngine]] = {
+    "duckdb": DuckDBQueryEngine,
+}
+
+
+def get_query_engine(df: DataFrameOrSeries, engine: str = "dataframe") -> QueryEngine:
+    if engine != "dataframe":
+        if engine not in QUERY_ENGINES:
+            raise ValueError(
+                f"Unknown query engine {engine!r}, expected one of "
+                f"{['dataframe'] + list(QUERY_ENGINES)}"
+            )
+        return QUERY_ENGINES[engine](df)
+
+    df_module_name = get_dataframe_module_name(df)
+    if df_module_name == "pandas":
+        return PandasQueryEngine(df)
+    if df_module_name == "polars":
+        if type(df).__name__ == "LazyFrame":
+            return PolarsLazyQueryEngine(df)
+        return PolarsQueryEngine(df)
+    raise TypeError(
+        "Server-side processing with the 'dataframe' engine is only available for "
+        f"Pandas and Polars DataFrames, not for {type(df)}. "
+        "Use server_side_engine='duckdb' for other DataFrames."
+    )
+
+
+class ServerSideTable:
+    """The full table, from which pages are formatted on request.
+
+    The table is filtered and sorted according to the 'search', 'columns'
+    and 'order' parameters of the DataTables request, and the rows
+    between 'start' and 'start' + 'length' are formatted with datatables_rows."""
+
+    def __init__(
+        self,
+        df: DataFrameOrSeries,
+        *,
+        column_count: int,
+        escape_html: bool = True,
+        float_columns_to_be_formatted_in_python: Optional[set[int]] = None,
+        warn_on_unexpected_types: bool = False,
+        warn_on_polars_get_fmt_not_found: bool = True,
+        json_encoder: Literal["auto", "stdlib", "orjson"] = "stdlib",
+        formatting_workers: int = 0,
+        engine: str = "dataframe",
+    ):
+        self.engine = get_query_engine(df, engine)
+        self.df = df
+        # The header might have an extra column for the index, see #141
+        self.column_offset = column_count - self.engine.column_count()
+        self.formatting_options: dict[str, Any] = {
+            "column_count": column_count,
+            "escape_html": escape_html,
+            "float_columns_to_be_formatted_in_python": float_columns_to_be_formatted_in_python,
+            "warn_on_unexpected_types": warn_on_unexpected_types,
+            "warn_on_polars_get_fmt_not_found": warn_on_polars_get_fmt_not_found,
+            "json_encoder": json_encoder,
+            "formatting_workers": formatting_workers,
+        }
+        # Paging through the same search and order does not filter
+        # and sort the table again
+        self._view_key: Optional[str] = None
+        self._view: Any = None
+
+    def __len__(self) -> int:
+        return self.engine.row_count()
+
+    def reuse_search_index(self, table: "ServerSideTable") -> None:
+        """Reuse the search index of another table on the same DataFrame,
+        e.g. when only the options of the ITable widget are updated"""
+        if (
+            type(table.engine) is type(self.engine)
+            and table.engine.row_count() == self.engine.row_count()
+            and table.engine.column_count() == self.engine.column_count()
+        ):
+            self.engine.search_index = table.engine.search_index
+
+    def get_page(self, request: Mapping[str, Any]) -> dict[str, Any]:
+        """Return the response to a DataTables server-side request. The rows
+        of the page are in 'data_json', formatted like in to_html_datatable"""
+        draw = int(request.get("draw", 0))
+        try:
+            view = self._get_view(request)
+            start = int(request.get("start", 0))
+            length = int(request.get("length", -1))
+            page = self.engine.rows(view, start, None if length < 0 else start + length)
+            data_json = datatables_rows(page, **self.formatting_options)
+        except Exception as e:
+            return {"draw": draw, "error": f"{type(e).__name__}: {e}"}
+        return {
+            "draw": draw,
+            "recordsTotal": self.engine.row_count(),
+            "recordsFiltered": self.engine.count(view),
+            "data_json": data_json,
+        }
+
+    def _get_view(self, request: Mapping[str, Any]) -> Any:
+        """The filtered and sorted table, as returned by the query engine"""
+        global_terms = _search_terms(request.get("search"))
+        column_terms: dict[int, list[str]] = {}
+        searchable_columns: list[int] = []
+        for i, column in enumerate(request.get("columns") or []):
+            j = i - self.column_offset
+            if j < 0 or not column.get("searchable", True):
+                continue
+            searchable_columns.append(j)
+            terms = _search_terms(column.get("search"))
+            if terms:
+                column_terms[j] = terms
+        if not request.get("columns"):
+            searchable_columns = list(range(self.engine.column_count()))
+        order = [
+            (int(o["column"]) - self.column_offset, o.get("dir") == "desc")
+            for o in request.get("order") or []
+            if int(o["column"]) >= self.column_offset
+        ]
+        for j, _ in order:
+            if j >= self.engine.column_count():
+                raise IndexError(f"Column {j + self.column_offset} is out of range")
+
+        key = json.dumps([global_terms, searchable_columns, column_terms, order])
+        if key != self._view_key:
+            self._view = None
+            self._view = self.engine.query(
+                global_terms, searchable_columns, column_terms, order
+            )
+            self._view_key = key
+        return self._view
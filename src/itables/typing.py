@@ -153,6 +153,8 @@ class DataTableOptions(TypedDict):
     stateSave: NotRequired[bool]
     stateDuration: NotRequired[int]
     deferRender: NotRequired[bool]
+    serverSide: NotRequired[bool]
+    ajax: NotRequired[Union[str, Mapping[str, Any]]]
 
     # DataTable options provided by its extensions
     buttons: NotRequired[Sequence[Union[str, Mapping[str, Any]]]]
@@ -192,12 +194,22 @@ class ITableOptions(DataTableOptions):
     show_df_type: NotRequired[bool]
 
     maxBytes: NotRequired[Union[int, str]]
+    maxBytes_mode: NotRequired[Literal["memory", "serialized"]]
     maxRows: NotRequired[int]
     maxColumns: NotRequired[int]
 
     allow_html: NotRequired[bool]
     format_floats_in_python: NotRequired[Union[bool, Literal["auto"]]]
     add_rank_to_categories: NotRequired[Union[bool, Literal["auto"]]]
+    dictionary_encoding: NotRequired[Union[bool, Literal["auto"]]]
+    compact_floats: NotRequired[bool]
+    datetime_encoding: NotRequired[Literal["text", "epoch"]]
+    data_json_orient: NotRequired[Literal["rows", "columns"]]
+    compress_data: NotRequired[bool]
+    json_encoder: NotRequired[Literal["auto", "stdlib", "orjson"]]
+    formatting_workers: NotRequired[int]
+    server_side_url: NotRequired[str]
+    server_side_engine: NotRequired[str]
 
     table_id: NotRequired[str]
     dt_url: NotRequired[str]
@@ -230,8 +242,11 @@ class DTForITablesOptions(DataTableOptions):
     style: NotRequired[Union[str, dict[str, str]]]
 
     data_json: NotRequired[str]
+    data_json_orient: NotRequired[Literal["rows", "columns"]]
+    data_json_compression: NotRequired[Literal["gzip"]]
     table_html: NotRequired[str]
     table_style: NotRequired[str]
+    server_side_url: NotRequired[str]
 
     selected_rows: NotRequired[Sequence[int]]
     filtered_row_count: NotRequired[int]
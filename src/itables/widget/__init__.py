@@ -1,12 +1,18 @@
 import importlib.metadata
 import pathlib
+from base64 import b64decode
 from typing import Optional
 
 import anywidget
 import traitlets
 
 from itables.javascript import get_itables_extension_arguments
-from itables.typing import DataFrameOrSeries, ITableOptions, Unpack
+from itables.typing import (
+    DataFrameOrSeries,
+    DTForITablesOptions,
+    ITableOptions,
+    Unpack,
+)
 
 try:
     __version__ = importlib.metadata.version("itables_anywidget")
@@ -14,6 +20,18 @@ except importlib.metadata.PackageNotFoundError:
     __version__ = "unknown"
 
 
+def _pop_data_json(dt_args: DTForITablesOptions) -> bytes:
+    """Remove data_json from dt_args and return it as bytes. The table data
+    is sent to the widget as a binary buffer rather than as a string in the
+    _dt_args dict. This only saves the copy (and escaping) of the JSON text
+    in the comm message, and the base64 encoding of compressed data: the rows
+    are still encoded to JSON in Python, and parsed in the browser."""
+    data_json = dt_args.pop("data_json", "")
+    if dt_args.get("data_json_compression") == "gzip":
+        return b64decode(data_json)
+    return data_json.encode("utf-8")
+
+
 class ITable(anywidget.AnyWidget):
     _esm = pathlib.Path(__file__).parent / "static" / "widget.js"
     _css = pathlib.Path(__file__).parent / "static" / "widget.css"
@@ -30,21 +48,34 @@ class ITable(anywidget.AnyWidget):
     # private traits that relate to df or to the DataTable arguments
     # (use .update() to update them)
     _dt_args = traitlets.Dict().tag(sync=True)
+    # the table data (UTF-8 JSON text, or gzip bytes), see _pop_data_json
+    _data_json = traitlets.Bytes().tag(sync=True)
+
+    # with server_side=True, the rows are requested by DataTables
+    # one page at a time, through custom messages
+    _server_side = traitlets.Bool().tag(sync=True)
 
     def __init__(
         self,
         df: Optional[DataFrameOrSeries] = None,
         caption: Optional[str] = None,
+        server_side: bool = False,
         **kwargs: Unpack[ITableOptions],
     ) -> None:
         super().__init__()
-        dt_args, other_args = get_itables_extension_arguments(df, caption, **kwargs)
+        self._server_side = server_side
+        self.on_msg(self._handle_custom_msg)
+        dt_args, other_args = get_itables_extension_arguments(
+            df, caption, server_side, **kwargs
+        )
+        self._server_side_table = other_args.pop("server_side_table", None)
         self._df = df
         self.caption = other_args.pop("caption") or ""
         self.classes = other_args.pop("classes")
         self._style = other_args.pop("style")
         self.selected_rows = other_args.pop("selected_rows")
 
+        self._data_json = _pop_data_json(dt_args)
         self._dt_args = dt_args
         assert not other_args, other_args
 
@@ -66,6 +97,8 @@ class ITable(anywidget.AnyWidget):
                 del kwargs[key]
                 del new_dt_args[key]
 
+        # An explicit df might have been modified in place
+        df_is_unchanged = df is None
         if df is None:
             df = self._df
         if "selected_rows" not in kwargs:
@@ -78,19 +111,33 @@ class ITable(anywidget.AnyWidget):
             kwargs["style"] = self.style
             pass
 
-        dt_args, other_args = get_itables_extension_arguments(df, caption, **kwargs)
+        dt_args, other_args = get_itables_extension_arguments(
+            df, caption, self._server_side, **kwargs
+        )
+        server_side_table = other_args.pop("server_side_table", None)
 
         self.classes = other_args.pop("classes")
         self._style = other_args.pop("style")
         self.caption = other_args.pop("caption")
 
+        data_json = None
         if df is None:
             del dt_args["data_json"]
+            dt_args.pop("data_json_orient", None)
+            dt_args.pop("data_json_compression", None)
             del dt_args["filtered_row_count"]
             del dt_args["downsampling_warning"]
             dt_args.pop("table_html", None)
+        elif self._server_side:
+            if df_is_unchanged and self._server_side_table is not None:
+                # The search index depends on the DataFrame only
+                server_side_table.reuse_search_index(self._server_side_table)
+            self._df = df
+            self._server_side_table = server_side_table
+            dt_args_changed = True
         else:
             self._df = df
+            data_json = _pop_data_json(dt_args)
             dt_args_changed = True
 
         # Remove auto-generated keys that are no longer applicable (e.g. when
@@ -98,6 +145,8 @@ class ITable(anywidget.AnyWidget):
         # are always freshly computed by get_itables_extension_arguments, so any
         # value left over from a previous call is stale and should be dropped.
         for key in (
+            "data_json_orient",
+            "data_json_compression",
             "keys_to_be_evaluated",
             "filtered_row_count",
             "downsampling_warning",
@@ -121,11 +170,28 @@ class ITable(anywidget.AnyWidget):
                 new_dt_args[key] = value
                 dt_args_changed = True
 
-        if dt_args_changed:
-            self._dt_args = new_dt_args
+        # The table data and the DataTable arguments are sent together
+        with self.hold_sync():
+            if data_json is not None:
+                self._data_json = data_json
+            if dt_args_changed:
+                self._dt_args = new_dt_args
 
         self.selected_rows = other_args.pop("selected_rows")
 
+        if self._server_side and df is not None:
+            # The table might have the same arguments, but new rows
+            self.send({"type": "server_side_reload"})
+
+    def _handle_custom_msg(self, _, content, buffers) -> None:
+        """Answer the requests of DataTables in server-side mode"""
+        if content.get("type") != "server_side_request":
+            return
+        if self._server_side_table is None:
+            return
+        response = self._server_side_table.get_page(content["request"])
+        self.send({"type": "server_side_response", "id": content["id"], **response})
+
     @property
     def df(self) -> Optional[DataFrameOrSeries]:
         return self._df
@@ -67,6 +67,8 @@ def updated_itable_outputs(
             for k in {
                 "columns",
                 "data_json",
+                "data_json_orient",
+                "data_json_compression",
                 "filtered_row_count",
                 "downsampling_warning",
             }:
@@ -0,0 +1,199 @@
+"""Benchmarks for the vectorized code paths of ITables.
+
+Each benchmark compares the output and the timing of a vectorized path
+with that of a per-value reference implementation, on the same data.
+The timings are recorded as test properties, e.g. in the report of
+pytest --junitxml.
+
+The benchmarks take a while, so they are skipped unless the
+ITABLES_BENCHMARKS environment variable is set."""
+
+import json
+import os
+import time
+from typing import Any, Callable
+
+import pytest
+
+if not os.environ.get("ITABLES_BENCHMARKS"):
+    pytest.skip(
+        "Set ITABLES_BENCHMARKS=1 to run the benchmarks", allow_module_level=True
+    )
+
+from itables.datatables_format import (
+    _format_narwhals_series,
+    _format_pandas_series,
+    _format_pyarrow_column,
+    _pandas_format_array,
+    encode_table_values,
+    escape_html_chars_in_column,
+    escape_non_finite_float,
+    escape_non_finite_floats,
+    format_float_values,
+)
+
+
+def best_time(function: Callable[[], Any], repeat: int = 3) -> float:
+    """Return the best execution time of function, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def test_benchmark_escape_non_finite_floats(record_property, rows=200_000, columns=4):
+    pytest.importorskip("pandas")
+    from itables.sample_pandas_dfs import generate_random_df
+
+    df = generate_random_df(rows, columns, ["float"])
+
+    def reference():
+        return [[escape_non_finite_float(v) for v in x._values] for _, x in df.items()]
+
+    def vectorized():
+        return [escape_non_finite_floats(x._values) for _, x in df.items()]
+
+    assert json.dumps(vectorized()) == json.dumps(reference(), default=float)
+
+    record_property("reference_time", best_time(reference))
+    record_property("vectorized_time", best_time(vectorized))
+
+
+@pytest.mark.parametrize("df_name", ["int_float_str", "countries", "big_integers"])
+def test_benchmark_json_encoder_backends(record_property, df_name, repeat=20):
+    pytest.importorskip("pandas")
+    pytest.importorskip("orjson")
+    from itables.sample_pandas_dfs import get_dict_of_test_dfs
+
+    df = get_dict_of_test_dfs()[df_name]
+    data = [list(row) for row in df.itertuples(index=False)] * repeat
+
+    def stdlib():
+        return encode_table_values(data, json_encoder="stdlib")
+
+    def orjson():
+        return encode_table_values(data, json_encoder="orjson")
+
+    assert json.loads(orjson()) == json.loads(stdlib())
+
+    record_property("stdlib_time", best_time(stdlib))
+    record_property("orjson_time", best_time(orjson))
+
+
+def test_benchmark_pandas_string_categorical(
+    record_property, rows=200_000, categories=40
+):
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+
+    values = [f"<category {i}>" for i in range(categories)] + [None]
+    x = pd.Series(pd.Categorical(np.random.default_rng(0).choice(values, rows)))
+
+    def reference():
+        return escape_html_chars_in_column(_pandas_format_array(x._values))
+
+    def vectorized():
+        return _format_pandas_series(x, True, False, False)
+
+    assert vectorized() == reference()
+
+    record_property("reference_time", best_time(reference, repeat=1))
+    record_property("vectorized_time", best_time(vectorized))
+
+
+def test_benchmark_format_float_values(record_property, rows=200_000):
+    pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+
+    values = np.random.default_rng(0).normal(size=rows) * 100
+
+    def reference():
+        return [str(value) for value in _pandas_format_array(values)]
+
+    def vectorized():
+        return format_float_values(values)
+
+    assert vectorized() == reference()
+
+    record_property("reference_time", best_time(reference))
+    record_property("vectorized_time", best_time(vectorized))
+
+
+@pytest.mark.parametrize("escape_html", [False, True])
+@pytest.mark.parametrize("format_floats_in_python", [False, True])
+def test_benchmark_pyarrow_columns(
+    record_property, escape_html, format_floats_in_python, rows=200_000
+):
+    pa = pytest.importorskip("pyarrow")
+    nw = pytest.importorskip("narwhals")
+    np = pytest.importorskip("numpy")
+
+    rng = np.random.default_rng(0)
+    floats = rng.normal(size=rows) * 100
+    floats[::7] = np.nan
+    table = pa.table(
+        {
+            "float": pa.array(floats, mask=rng.random(rows) < 0.1),
+            "string": pa.array(rng.choice(["a", "<b>", "c&d", None], size=rows)),
+            "dictionary": pa.array(
+                rng.choice(["a", "<b>", "c&d", None], size=rows)
+            ).dictionary_encode(),
+        }
+    )
+    series = [nw.from_native(x, series_only=True) for x in table.columns]
+
+    def reference():
+        return [
+            _format_narwhals_series(x, escape_html, format_floats_in_python, False)
+            for x in series
+        ]
+
+    def vectorized():
+        return [
+            _format_pyarrow_column(x, escape_html, format_floats_in_python)
+            for x in table.columns
+        ]
+
+    assert vectorized() == reference()
+
+    record_property("reference_time", best_time(reference))
+    record_property("vectorized_time", best_time(vectorized))
+
+
+def test_benchmark_narwhals_series(record_property, rows=200_000):
+    """Compare the Narwhals path with the per-value formatting that it
+    replaces, and with the Pandas path on the same data"""
+    pytest.importorskip("pandas")
+    nw = pytest.importorskip("narwhals")
+    from itables.sample_pandas_dfs import generate_random_df
+
+    df = generate_random_df(rows, 3, ["int", "float", "str"])
+    series = [nw.from_native(x, series_only=True) for _, x in df.items()]
+
+    def reference():
+        return [
+            (
+                [escape_non_finite_float(v) for v in x]
+                if x.dtype.is_float()
+                else (
+                    escape_html_chars_in_column([str(v) for v in x])
+                    if x.dtype == nw.String
+                    else [v for v in x]
+                )
+            )
+            for x in series
+        ]
+
+    def vectorized():
+        return [_format_narwhals_series(x, True, False, False) for x in series]
+
+    def pandas():
+        return [_format_pandas_series(x, True, False, False) for _, x in df.items()]
+
+    assert json.dumps(vectorized()) == json.dumps(reference(), default=int)
+
+    record_property("reference_time", best_time(reference))
+    record_property("vectorized_time", best_time(vectorized))
+    record_property("pandas_time", best_time(pandas))
@@ -6,7 +6,16 @@ from datetime import date, datetime, timedelta
 
 import pytest
 
-from itables.datatables_format import datatables_rows, generate_encoder
+from itables.datatables_format import (
+    compress_data_json,
+    datatables_rows,
+    decompress_data_json,
+    encode_columns,
+    format_columns,
+    generate_encoder,
+    iter_compressed_data_json,
+    iter_encoded_columns,
+)
 from itables.javascript import (
     JavascriptCode,
     _column_count_in_header,
@@ -658,7 +667,7 @@ def test_float_dtype_non_finite_encoding(lib, dtype, pi_value, nan_encoded):
 
     dt_args = get_itable_arguments(df, format_floats_in_python=False, showIndex=False)
     assert "data_json" in dt_args
-    assert dt_args["data_json"] == json.dumps(
+    assert json.loads(dt_args["data_json"]) == (
         [
             [1.0],
             [0.0],
@@ -688,7 +697,7 @@ def test_pandas_categorical_sorting():
     dt_args = get_itable_arguments(df)
     assert "data_json" in dt_args
     # Null sorts first (rank 0), categories 1-indexed: low=1, medium=2, high=3
-    assert dt_args["data_json"] == "[[3, 1], [1, 2], [2, 3], [1, 4]]"
+    assert json.loads(dt_args["data_json"]) == [[3, 1], [1, 2], [2, 3], [1, 4]]
     assert "columnDefs" in dt_args
     assert dt_args["columnDefs"][0]["targets"] == 0
 
@@ -718,3 +727,319 @@ def test_polars_categorical_with_missing_values():
     # A polars Categorical has no category order, so we sort the categories
     # alphabetically: null sorts first (rank 0), then a=1, b=2
     assert data == [[2], [0], [1]]
+
+
+def test_pyarrow_dictionary_with_missing_values():
+    """Null values in categorical columns of other dataframes sort first (rank 0)"""
+    pa = pytest.importorskip("pyarrow")
+    pytest.importorskip("narwhals")
+
+    table = pa.table({"cat": pa.array(["b", None, "a", "b"]).dictionary_encode()})
+    dt_args = get_itable_arguments(table)
+    data = json.loads(dt_args["data_json"])
+    assert data == [[2], [0], [1], [2]]
+    assert 'var categories = ["a", "b"];' in str(dt_args["columnDefs"][0]["render"])
+
+
+@pytest.mark.parametrize("lib", ["pandas", "polars"])
+@pytest.mark.parametrize("dtype", ["float32", "float64"])
+def test_vectorized_non_finite_float_escaping(lib, dtype):
+    """The vectorized escaping matches escape_non_finite_float"""
+    from itables.datatables_format import (
+        _escape_non_finite_polars_floats,
+        escape_non_finite_float,
+        escape_non_finite_floats,
+    )
+
+    values = [1.5, math.nan, 0.1, math.inf, -math.inf, None]
+    if lib == "pandas":
+        pd = pytest.importorskip("pandas")
+        x = pd.Series(values, dtype=dtype)
+        actual = escape_non_finite_floats(x._values)
+        expected = [escape_non_finite_float(v) for v in x._values]
+    else:
+        pl = pytest.importorskip("polars")
+        x = pl.Series(values, dtype=getattr(pl, dtype.title()))
+        actual = _escape_non_finite_polars_floats(x)
+        expected = [escape_non_finite_float(v) for v in x.to_list()]
+
+    assert json.dumps(actual) == json.dumps(expected, default=float)
+
+
+def test_data_json_orient_columns(df_and_expected):
+    """The column-major data_json is the transpose of the row-major one"""
+    df = df_and_expected[0]
+    rows = json.loads(get_itable_arguments(df)["data_json"])
+    dt_args = get_itable_arguments(df, data_json_orient="columns")
+    assert dt_args["data_json_orient"] == "columns"
+    columns = json.loads(dt_args["data_json"])
+    assert [list(row) for row in zip(*columns)] == rows
+
+
+def test_orjson_encoder_gives_the_same_data(df_and_expected):
+    pytest.importorskip("orjson")
+    df = df_and_expected[0]
+    stdlib_data = get_itable_arguments(df, json_encoder="stdlib")["data_json"]
+    orjson_data = get_itable_arguments(df, json_encoder="orjson")["data_json"]
+    assert json.loads(orjson_data) == json.loads(stdlib_data)
+
+
+def test_orjson_encoder_gives_the_same_data_on_the_sample_dfs(
+    df, format_floats_in_python
+):
+    pytest.importorskip("orjson")
+    stdlib_data, orjson_data = (
+        get_itable_arguments(
+            df,
+            format_floats_in_python=format_floats_in_python,
+            json_encoder=json_encoder,
+        )["data_json"]
+        for json_encoder in ["stdlib", "orjson"]
+    )
+    assert json.loads(orjson_data) == json.loads(stdlib_data)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        [[1, math.nan]],
+        [(None, -math.inf), (2.5, "x")],
+        [[None, [math.inf]]],
+        {"a": [None, math.nan]},
+        # A NaN after the first chunks of a large table
+        [[i, None] for i in range(100_000)] + [[0, math.nan]],
+    ],
+)
+@pytest.mark.parametrize("json_encoder", ["stdlib", "orjson"])
+def test_non_finite_floats_are_rejected_by_both_encoders(data, json_encoder):
+    if json_encoder == "orjson":
+        pytest.importorskip("orjson")
+    from itables.datatables_format import encode_table_values
+
+    with pytest.raises(ValueError, match="not JSON compliant"):
+        encode_table_values(data, json_encoder=json_encoder)
+
+
+def test_orjson_encoder_falls_back_to_stdlib_for_very_large_integers():
+    pytest.importorskip("orjson")
+    from itables.datatables_format import encode_table_values
+
+    assert encode_table_values([[2**63 - 1]], json_encoder="orjson") == (
+        "[[9223372036854775807]]"
+    )
+    assert encode_table_values([[2**70, 1]], json_encoder="orjson") == (
+        "[[1180591620717411303424, 1]]"
+    )
+
+
+def test_json_encoder_must_be_valid():
+    from itables.datatables_format import get_json_encoder_backend
+
+    assert get_json_encoder_backend("stdlib") == "stdlib"
+    with pytest.raises(ValueError, match="json_encoder"):
+        get_json_encoder_backend("ujson")  # type: ignore
+
+
+@pytest.mark.parametrize("list_len", [None, 2, 5, -1])
+def test_polars_expression_formatting_matches_get_fmt(list_len):
+    """The Polars expressions format the columns like Polars' _s.get_fmt"""
+    pl = pytest.importorskip("polars")
+    from datetime import time
+    from decimal import Decimal
+
+    from itables.datatables_format import _format_polars_columns_with_expressions
+
+    df = pl.DataFrame(
+        {
+            "date": [date(2022, 1, 1), None, date(1, 1, 1), date(9999, 12, 31)],
+            "datetime": [
+                datetime(2022, 1, 1, 18, 5, 27),
+                datetime(2022, 1, 1, 18, 5, 27, 123000),
+                datetime(2022, 1, 1, 18, 5, 27, 500),
+                None,
+            ],
+            "time": [time(1, 2, 3), time(1, 2, 3, 4000), None, time(0)],
+            "decimal": [Decimal("1.50"), Decimal("-2.25"), None, Decimal("0.01")],
+            "list": [[], [1], None, list(range(7))],
+            "list_of_str": [["a", "b"], None, [None], ["x"] * 5],
+            "nested_list": [[[1, 2], [3]], None, [], [[1]] * 4],
+            "struct": [
+                {"a": "xx", "b": date(2020, 1, 1)},
+                None,
+                {"a": None, "b": None},
+                {"a": "", "b": None},
+            ],
+        }
+    ).with_columns(
+        pl.col("datetime").dt.replace_time_zone("US/Eastern").alias("datetime_tz")
+    )
+    if not hasattr(df["date"]._s, "get_fmt"):
+        pytest.skip("Polars get_fmt is not available")
+
+    with pl.Config(fmt_table_cell_list_len=list_len):
+        formatted = _format_polars_columns_with_expressions(df)
+        assert set(formatted) == set(range(len(df.columns)))
+        for i, col in enumerate(df.columns):
+            x = df[col]
+            assert formatted[i] == [x._s.get_fmt(j, 30) for j in range(len(x))], col
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["a", "<b>", "x & y", ">"],
+        ["no", "special", "characters"],
+        ["a\x00b", "<b>"],
+        ["a", None, "<b>"],
+    ],
+)
+def test_escape_html_chars_in_column(values):
+    from itables.datatables_format import (
+        BULK_HTML_ESCAPING_MIN_ROWS,
+        escape_html_chars,
+        escape_html_chars_in_column,
+    )
+
+    values = values * BULK_HTML_ESCAPING_MIN_ROWS
+    assert escape_html_chars_in_column(values) == [escape_html_chars(v) for v in values]
+
+
+@pytest.mark.parametrize("lib", ["pandas", "polars", "narwhals"])
+def test_bulk_html_escaping_of_large_string_columns(lib):
+    from itables.datatables_format import BULK_HTML_ESCAPING_MIN_ROWS
+
+    values = ["<b>bold</b>", "a & b", None, "plain"] * BULK_HTML_ESCAPING_MIN_ROWS
+    if lib == "pandas":
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame({"s": values})
+    else:
+        pl = pytest.importorskip("polars")
+        df = pl.DataFrame({"s": values})
+        if lib == "narwhals":
+            nw = pytest.importorskip("narwhals")
+            df = nw.from_native(df)
+
+    data = json.loads(datatables_rows(df))
+    assert data[:2] == [["&lt;b&gt;bold&lt;/b&gt;"], ["a &amp; b"]]
+    assert len(data) == len(values)
+    assert data[-4:] == data[:4]
+
+
+def test_formatting_workers_give_the_same_data_json(df):
+    assert datatables_rows(df, formatting_workers=4) == datatables_rows(df)
+
+
+@pytest.mark.parametrize("orient", ["rows", "columns"])
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+def test_iter_encoded_columns(df, orient, chunk_rows):
+    formatted_columns = format_columns(df)
+    expected = encode_columns(formatted_columns, row_count=len(df), orient=orient)
+    chunks = list(
+        iter_encoded_columns(
+            formatted_columns,
+            row_count=len(df),
+            orient=orient,
+            chunk_rows=chunk_rows,
+        )
+    )
+    assert "".join(chunks) == expected
+
+
+def test_compressed_data_json():
+    chunks = ["[[1, ", '"é"]', ", [2, ", '"___NaN___"]]']
+    compressed = "".join(iter_compressed_data_json(chunks))
+    assert decompress_data_json(compressed) == "".join(chunks)
+    assert decompress_data_json(compress_data_json("".join(chunks))) == "".join(chunks)
+
+
+@pytest.mark.parametrize("dtype", ["object", "str", "string"])
+@pytest.mark.parametrize("escape_html", [False, True])
+def test_pandas_string_categorical_is_formatted_like_format_array(dtype, escape_html):
+    pd = pytest.importorskip("pandas")
+    from itables.datatables_format import (
+        _format_pandas_series,
+        _pandas_format_array,
+        escape_html_chars_in_column,
+    )
+
+    x = pd.Series(["b", None, "<a>", "b"], dtype=dtype).astype("category")
+    expected = _pandas_format_array(x._values)
+    if escape_html:
+        expected = escape_html_chars_in_column(expected)
+    assert _format_pandas_series(x, escape_html, False, False) == expected
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [],
+        [math.nan],
+        [1.0, 2.0],
+        [1.5, 2.25, math.nan],
+        [0.0, -0.0, math.inf, -math.inf],
+        [1e-7, 1.0],
+        [1e7, 1.5],
+        [1e12, 0.5, math.nan],
+        [123456789.123, math.inf],
+        [1e300, 1.0],
+        [0.1, 0.2, 0.3],
+    ],
+)
+@pytest.mark.parametrize("precision", [0, 3, 6])
+def test_format_float_values_is_identical_to_format_array(values, precision):
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    from itables.datatables_format import _pandas_format_array, format_float_values
+
+    values = np.array(values, dtype=float)
+    with pd.option_context("display.precision", precision):
+        expected = [str(value) for value in _pandas_format_array(values)]
+        assert format_float_values(values) == expected
+
+
+@pytest.mark.parametrize("precision", [2, 6])
+def test_float32_columns_are_formatted_like_format_array(precision):
+    pd = pytest.importorskip("pandas")
+    np = pytest.importorskip("numpy")
+    from itables.datatables_format import _format_pandas_series, _pandas_format_array
+
+    rng = np.random.default_rng(0)
+    columns = [
+        np.array([0.000001, 0.5], dtype=np.float32),
+        np.array([0.001, 0.25, math.nan], dtype=np.float32),
+        (rng.random(1000) * 10.0 ** rng.integers(-8, 8, 1000)).astype(np.float32),
+    ]
+    with pd.option_context("display.precision", precision):
+        for values in columns:
+            expected = [str(value) for value in _pandas_format_array(values)]
+            formatted = _format_pandas_series(pd.Series(values), True, True, False)
+            assert [display for display, _ in formatted] == expected
+
+
+def test_format_float_values_falls_back_to_pandas_with_a_custom_float_format():
+    pd = pytest.importorskip("pandas")
+    from itables.datatables_format import format_float_values
+
+    with pd.option_context("display.float_format", "{:.2f}".format):
+        assert format_float_values([1.0, 2.0]) is None
+
+
+def test_scale_float_column():
+    from itables.datatables_format import scale_float_column
+
+    assert scale_float_column(
+        [
+            ["1.50", 1.5],
+            ["-2.25", -2.25],
+            ["NaN", "___NaN___"],
+            ["-inf", "___-Infinity___"],
+            [None, None],
+        ]
+    ) == ([150, -225, "___NaN___", "___-Infinity___", None], 2)
+    assert scale_float_column([["1", 1.0], ["2", 2.0]]) == ([1, 2], 0)
+
+    # different precisions, scientific notation, negative zero, unsafe integers
+    assert scale_float_column([["1.5", 1.5], ["2.25", 2.25]]) is None
+    assert scale_float_column([["1.000000e-09", 1e-9]]) is None
+    assert scale_float_column([["-0.0", -0.0]]) is None
+    assert scale_float_column([["12345678901234567.0", 1.2345678901234568e16]]) is None
@@ -4,8 +4,11 @@ import pytest
 
 from itables.downsample import (
     as_nbytes,
+    column_nbytes,
     downsample,
     nbytes,
+    plan_downsampling,
+    serialized_column_nbytes,
     shrink_towards_target_aspect_ratio,
 )
 
@@ -131,3 +134,89 @@ def test_downsample_to_odd_number_of_rows():
     dn, _ = downsample(df, max_rows=3)
     assert len(dn) == 3
     assert dn["x"].to_list() == [0, 1, 16]
+
+
+def test_downsample_polars_to_odd_number_of_rows():
+    if pl is None:
+        pytest.skip("Polars is not available")
+    df = pl.DataFrame({"x": range(17), "y": range(17)})
+    dn, _ = downsample(df, max_rows=3, max_columns=1)
+    assert dn.columns == ["x"]
+    assert dn["x"].to_list() == [0, 1, 16]
+
+
+@pytest.mark.parametrize("df", large_tables())
+@pytest.mark.parametrize("max_bytes", [1e2, 1e3, 1e4, 1e5])
+def test_plan_downsampling_gives_the_shape_of_the_downsampled_table(df, max_bytes):
+    dn, _ = downsample(df, max_bytes=max_bytes)
+    column_bytes = column_nbytes(df)
+    assert plan_downsampling(len(df), column_bytes, max_bytes=int(max_bytes)) == (
+        len(dn),
+        len(dn.columns),
+    )
+
+
+def test_plan_downsampling_to_a_single_cell():
+    assert plan_downsampling(1000, [8000] * 10, max_bytes=4) is None
+
+
+@pytest.mark.parametrize("df", large_tables(N=1000, M=20))
+@pytest.mark.parametrize("max_bytes", [1e3, 1e4, 1e5])
+def test_serialized_max_bytes_mode_bounds_the_size_of_data_json(df, max_bytes):
+    from itables.javascript import get_itable_arguments
+
+    data_json = get_itable_arguments(
+        df,
+        maxBytes=int(max_bytes),
+        maxBytes_mode="serialized",
+        showIndex=False,
+        dictionary_encoding=False,
+        json_encoder="stdlib",
+    )["data_json"]
+    assert max_bytes / 2 < len(data_json) <= max_bytes * 1.1
+
+
+def test_serialized_column_nbytes():
+    df = pd.DataFrame({"x": [1] * 1000, "y": ["abc"] * 1000})
+    # Each row is encoded as '[1, "abc"], ', i.e. 3 + 7 bytes plus 2 shared bytes
+    assert serialized_column_nbytes(df) == [3600, 8400]
+
+
+@pytest.mark.parametrize("df_name", ["capital", "countries"])
+def test_serialized_max_bytes_mode_accounts_for_the_index(df_name):
+    from itables.javascript import get_itable_arguments
+    from itables.sample_dfs import get_dict_of_test_dfs
+
+    df = get_dict_of_test_dfs()[df_name]
+    data_json = get_itable_arguments(
+        df,
+        maxBytes="8KB",
+        maxBytes_mode="serialized",
+        showIndex=True,
+        json_encoder="stdlib",
+    )["data_json"]
+    assert len(data_json) <= as_nbytes("8KB")
+
+
+@pytest.mark.parametrize("max_bytes", [0, 10, 1000])
+def test_serialized_max_bytes_mode_on_pyarrow_tables(max_bytes):
+    pa = pytest.importorskip("pyarrow")
+    table = pa.table({"x": range(1000), "y": ["abc"] * 1000})
+    dn, _ = downsample(table, max_bytes=max_bytes, max_bytes_mode="serialized")
+    assert isinstance(dn, pa.Table)
+    if not max_bytes:
+        assert dn.equals(table)
+    elif dn.shape != (1, 1):
+        assert sum(serialized_column_nbytes(dn)) <= max_bytes
+
+
+def test_no_size_estimate_without_max_bytes(monkeypatch):
+    import itables.downsample
+
+    def no_estimate(*args, **kwargs):
+        raise AssertionError("The size of the table was estimated")
+
+    monkeypatch.setattr(itables.downsample, "serialized_column_nbytes", no_estimate)
+    df = pd.DataFrame({"x": range(1000)})
+    dn, warning = downsample(df, max_rows=10, max_bytes_mode="serialized")
+    assert len(dn) == 10 and warning
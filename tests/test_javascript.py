@@ -1,4 +1,5 @@
 import json
+from datetime import datetime
 from pathlib import Path
 
 import pytest
@@ -30,10 +31,10 @@ def test_get_itable_arguments():
     dt_args = get_itable_arguments(df=pd.DataFrame({"x": [1, 2]}))
     del dt_args["table_html"]
     del dt_args["connected"]
+    assert json.loads(dt_args.pop("data_json")) == [[1], [2]]
     assert dt_args == {
         "classes": get_compact_classes(opt.classes),
         "style": get_compact_style(opt.style),
-        "data_json": "[[1], [2]]",
         "order": [],
         "display_logo_when_loading": opt.display_logo_when_loading,
         "warn_on_undocumented_option": opt.warn_on_undocumented_option,
@@ -57,10 +58,10 @@ def test_get_itable_arguments_with_index():
     )
     del dt_args["table_html"]
     del dt_args["connected"]
+    assert json.loads(dt_args.pop("data_json")) == [["a", 1], ["b", 2]]
     assert dt_args == {
         "classes": get_compact_classes(opt.classes),
         "style": get_compact_style(opt.style),
-        "data_json": '[["a", 1], ["b", 2]]',
         "order": [],
         "display_logo_when_loading": opt.display_logo_when_loading,
         "warn_on_undocumented_option": opt.warn_on_undocumented_option,
@@ -264,6 +265,107 @@ def test_categorical_labels_are_escaped_when_allow_html_is_false():
     assert "</script><script>alert(1)</script>" in render_allow_html
 
 
+def test_low_cardinality_string_columns_are_dictionary_encoded():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "status": ["open", "closed", "<b>pending</b>"] * 1000,
+            "id": [f"id{i}" for i in range(3000)],
+        }
+    )
+
+    itable_args = get_itable_arguments(df, dictionary_encoding="auto")
+    assert itable_args["columnDefs"][0]["targets"] == 0
+    render = str(itable_args["columnDefs"][0]["render"])
+    assert 'var values = ["&lt;b&gt;pending&lt;/b&gt;", "closed", "open"];' in render
+    assert ["columnDefs", 0, "render"] in itable_args["keys_to_be_evaluated"]
+
+    data = json.loads(itable_args["data_json"])
+    assert data[:3] == [[3, "id0"], [2, "id1"], [1, "id2"]]
+
+    itable_args = get_itable_arguments(df, dictionary_encoding=False)
+    assert "columnDefs" not in itable_args
+    data = json.loads(itable_args["data_json"])
+    assert data[:3] == [
+        ["open", "id0"],
+        ["closed", "id1"],
+        ["&lt;b&gt;pending&lt;/b&gt;", "id2"],
+    ]
+
+
+def test_dictionary_encoding_of_polars_string_columns_with_nulls():
+    pl = pytest.importorskip("polars")
+    df = pl.DataFrame({"region": ["EU", None, "US"]})
+
+    # small tables are not encoded in mode "auto"
+    assert "columnDefs" not in get_itable_arguments(df, dictionary_encoding="auto")
+
+    itable_args = get_itable_arguments(df, dictionary_encoding=True)
+    render = str(itable_args["columnDefs"][0]["render"])
+    assert 'var values = ["EU", "US"];' in render
+    assert json.loads(itable_args["data_json"]) == [[1], [0], [2]]
+
+
+def test_compact_floats_are_sent_as_scaled_integers():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"x": [1.5, -2.25, float("nan")], "y": [1e-9, 1.0, 2.0]})
+
+    itable_args = get_itable_arguments(df, compact_floats=True)
+    data = json.loads(itable_args["data_json"])
+    assert [row[0] for row in data] == [150, -225, "___NaN___"]
+    # y needs the scientific notation, so it is still sent as [display, value] pairs
+    assert data[0][1] == ["1.000000e-09", 1e-09]
+
+    float_pair_def, scaled_float_def = itable_args["columnDefs"]
+    assert float_pair_def["targets"] == [1]
+    assert scaled_float_def["targets"] == [0]
+    assert "var precision = 2;" in str(scaled_float_def["render"])
+
+
+def test_datetimes_are_sent_as_epochs():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {
+            "t": pd.to_datetime(
+                ["2024-01-01 12:00:00.000", "2024-01-01 12:00:00.500", None]
+            ),
+            "d": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-03"]),
+            "ns": pd.to_datetime(["2024-01-01 00:00:00.000000001"] * 3),
+        }
+    )
+
+    itable_args = get_itable_arguments(df, datetime_encoding="epoch")
+    data = json.loads(itable_args["data_json"])
+    assert [row[0] for row in data] == [1704110400000, 1704110400500, None]
+    assert [row[1] for row in data] == [1704067200000, 1704153600000, 1704240000000]
+    # Nanoseconds can't be sent as Javascript numbers
+    assert data[0][2] == "2024-01-01 00:00:00.000000001"
+
+    datetime_def, date_def = itable_args["columnDefs"]
+    assert datetime_def["targets"] == 0
+    assert (
+        'var format = {"unit": "ms", "fraction": 3, "date_only": false, "null": "NaT"};'
+        in str(datetime_def["render"])
+    )
+    assert date_def["targets"] == 1
+    assert '"date_only": true' in str(date_def["render"])
+
+
+@pytest.mark.parametrize("module_name", ["pandas", "polars"])
+def test_microsecond_epochs_are_safe_javascript_integers(module_name):
+    module = pytest.importorskip(module_name)
+    value = datetime(2260, 1, 1, 0, 0, 0, 1)
+    df = module.DataFrame({"t": [value], "u": [datetime(2024, 1, 1, 0, 0, 0, 1)]})
+
+    itable_args = get_itable_arguments(df, datetime_encoding="epoch")
+    (row,) = json.loads(itable_args["data_json"])
+    # 9151488000000001 would be parsed as a BigInt, so we send the text
+    assert isinstance(row[0], str) and row[0].startswith("2260-01-01")
+    assert row[1] == 1704067200000001
+    (datetime_def,) = itable_args["columnDefs"]
+    assert datetime_def["targets"] == 1
+
+
 def test_html_display_is_supported_without_ipython(monkeypatch):
     import builtins
 
@@ -340,3 +442,20 @@ def test_show_prints_markdown_table_in_pure_python(monkeypatch, capsys):
     # and definitely no HTML/JavaScript in there
     assert "<table" not in out
     assert "<script" not in out
+
+
+@pytest.mark.parametrize(
+    "option",
+    [
+        {"data_json_orient": "columns"},
+        {"json_encoder": "stdlib"},
+        {"dictionary_encoding": True},
+        {"compact_floats": True},
+        {"datetime_encoding": "epoch"},
+    ],
+)
+def test_data_encoding_options_are_not_available_with_to_html(option):
+    from itables.javascript import set_default_options
+
+    with pytest.raises(TypeError, match="not available"):
+        set_default_options(dict(option), use_to_html=True, app_mode=False)
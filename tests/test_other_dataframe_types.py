@@ -206,3 +206,51 @@ def test_dataframe_type_modin_df():
     it_args_nw = get_itable_arguments(df_nw, show_df_type=True)
     assert "downsampling_warning" in it_args_nw
     assert it_args_nw["downsampling_warning"] == "modin.pandas.DataFrame (narwhalified)"
+
+
+@pytest.mark.parametrize("format_floats_in_python", [False, True])
+def test_pyarrow_table_is_formatted_like_narwhals_series(
+    pl_df, format_floats_in_python, monkeypatch
+):
+    """The pyarrow.compute formatting gives the same table data as the
+    generic Narwhals formatting"""
+    pytest.importorskip("pyarrow")
+    pytest.importorskip("narwhals")
+    import itables.datatables_format
+
+    table = pl_df.to_arrow()
+    float_columns = set(range(table.num_columns)) if format_floats_in_python else set()
+    expected = datatables_rows(
+        table, float_columns_to_be_formatted_in_python=float_columns
+    )
+    monkeypatch.setattr(
+        itables.datatables_format, "_format_pyarrow_column", lambda *args: None
+    )
+    assert expected == datatables_rows(
+        table, float_columns_to_be_formatted_in_python=float_columns
+    )
+
+
+@pytest.mark.parametrize("dtype", ["object", "string", "string[pyarrow]"])
+def test_narwhals_pandas_like_strings_keep_their_missing_value_repr(dtype):
+    """The missing strings are displayed like the backend does, e.g. 'nan' or
+    '<NA>' for Pandas, as when the values were formatted one at a time"""
+    pd = pytest.importorskip("pandas")
+    nw = pytest.importorskip("narwhals")
+    from itables.datatables_format import (
+        _format_narwhals_series,
+        escape_html_chars_in_column,
+    )
+
+    if dtype == "string[pyarrow]":
+        pytest.importorskip("pyarrow")
+    x = nw.from_native(
+        pd.Series(["a<b", float("nan"), "c"], dtype=dtype), series_only=True
+    )
+    assert x.dtype == nw.String
+    expected = [str(v) for v in x]
+    assert expected[1] in ("nan", "<NA>")
+    assert _format_narwhals_series(x, False, False, False) == expected
+    assert _format_narwhals_series(
+        x, True, False, False
+    ) == escape_html_chars_in_column(expected)
@@ -89,7 +89,7 @@ def test_show_index_has_no_effect_on_dataframes(show_index):
     )
     itable_args = get_itable_arguments(df, showIndex=show_index)
     assert "data_json" in itable_args, set(itable_args)
-    assert itable_args["data_json"] == "[[1, 4], [2, 5], [3, 6]]"
+    assert json.loads(itable_args["data_json"]) == [[1, 4], [2, 5], [3, 6]]
 
 
 def test_get_countries(connected):
@@ -175,7 +175,12 @@ def test_polars_df_with_categorical_and_enums():
     assert "data_json" in dt_args
     # Categorical and Enum columns are encoded as integer ranks (null=0, categories 1-indexed).
     # Cat ranks: a=1, b=2, c=3. Enum ranks: north=1, south=2, east=3, west=4.
-    assert dt_args["data_json"] == "[[1, 1, 1], [2, 2, 2], [1, 1, 1], [3, 4, 3]]"
+    assert json.loads(dt_args["data_json"]) == [
+        [1, 1, 1],
+        [2, 2, 2],
+        [1, 1, 1],
+        [3, 4, 3],
+    ]
     assert "columnDefs" in dt_args
     # Each categorical column gets its own columnDef with embedded categories
     assert dt_args["columnDefs"][0]["targets"] == 0
@@ -194,7 +199,7 @@ def test_polars_categories_do_not_leak_from_one_df_to_the_next():
     assert "columnDefs" in dt_args
 
     # Only the categories of 'other', in alphabetical order: yy=1, zz=2
-    assert dt_args["data_json"] == "[[2], [1]]"
+    assert json.loads(dt_args["data_json"]) == [[2], [1]]
     assert '["yy", "zz"]' in dt_args["columnDefs"][0]["render"]
 
 
@@ -209,18 +214,59 @@ def test_polars_df_with_nan_and_none():
     assert df.dtypes == [pl.Int64, pl.Float64, pl.String]
     dt_args = get_itable_arguments(df, format_floats_in_python=False)
     assert "data_json" in dt_args
-    assert (
-        dt_args["data_json"] == '[[1, 0.1, "x"], '
-        "[2, null, null], "
-        '[null, "___NaN___", "z"], '
-        '[4, 0.4, "w"]]'
-    )
+    assert json.loads(dt_args["data_json"]) == [
+        [1, 0.1, "x"],
+        [2, None, None],
+        [None, "___NaN___", "z"],
+        [4, 0.4, "w"],
+    ]
 
     dt_args = get_itable_arguments(df)
     assert "data_json" in dt_args
-    assert (
-        dt_args["data_json"] == '[[1, ["0.1", 0.1], "x"], '
-        "[2, [null, null], null], "
-        '[null, ["NaN", "___NaN___"], "z"], '
-        '[4, ["0.4", 0.4], "w"]]'
+    assert json.loads(dt_args["data_json"]) == [
+        [1, ["0.1", 0.1], "x"],
+        [2, [None, None], None],
+        [None, ["NaN", "___NaN___"], "z"],
+        [4, ["0.4", 0.4], "w"],
+    ]
+
+
+@pytest.mark.parametrize("maxBytes", [0, "8KB"])
+def test_lazyframe_gives_the_same_table_as_the_collected_dataframe(pl_df, maxBytes):
+    dt_args = get_itable_arguments(pl_df.lazy(), maxBytes=maxBytes, show_df_type=True)
+    expected = get_itable_arguments(pl_df, maxBytes=maxBytes, show_df_type=True)
+    assert dt_args.pop("downsampling_warning").replace(
+        "polars.LazyFrame", "polars.DataFrame"
+    ) == expected.pop("downsampling_warning")
+    assert dt_args == expected
+
+
+def test_lazyframe_only_collects_the_rows_that_are_displayed():
+    from itables.downsample import downsample
+
+    evaluated = []
+
+    def opposite(x):
+        evaluated.append(x)
+        return -x
+
+    lf = pl.LazyFrame({"x": range(1_000_000)}).with_columns(
+        y=pl.col("x").map_elements(opposite, return_dtype=pl.Int64)
+    )
+    df, warning = downsample(lf, max_rows=4)
+    assert df["y"].to_list() == [0, -1, -999_998, -999_999]
+    assert "from 1,000,000 rows as maxRows=4" in warning
+    assert len(evaluated) < 1000
+
+
+def test_lazyframe_size_is_not_estimated_without_max_bytes(monkeypatch):
+    import itables.downsample
+
+    def no_estimate(*args, **kwargs):
+        raise AssertionError("The size of the LazyFrame was estimated")
+
+    monkeypatch.setattr(
+        itables.downsample, "_polars_lazyframe_column_nbytes", no_estimate
     )
+    dt_args = get_itable_arguments(pl.LazyFrame({"x": range(100)}), maxBytes=0)
+    assert len(json.loads(dt_args["data_json"])) == 100
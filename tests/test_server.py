@@ -0,0 +1,105 @@
+import json
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import pytest
+
+from itables.server import parse_datatables_request, serve
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"x": [3.5, 1.25, 2.0], "s": ["Paris", "London", "Rome"]})
+
+
+def _query_string(**params):
+    # The parameters are encoded like in jQuery.param
+    return urlencode(
+        {
+            "draw": 1,
+            "columns[0][data]": 0,
+            "columns[0][searchable]": "true",
+            "columns[0][search][value]": "",
+            "columns[1][data]": 1,
+            "columns[1][searchable]": "true",
+            "columns[1][search][value]": "",
+            "search[value]": "",
+            "search[regex]": "false",
+            "start": 0,
+            "length": 10,
+            **params,
+        }
+    )
+
+
+def test_parse_datatables_request():
+    request = parse_datatables_request(
+        _query_string(**{"order[0][column]": 1, "order[0][dir]": "desc"})
+    )
+    assert request == {
+        "draw": "1",
+        "columns": [
+            {"data": "0", "searchable": True, "search": {"value": ""}},
+            {"data": "1", "searchable": True, "search": {"value": ""}},
+        ],
+        "search": {"value": "", "regex": False},
+        "start": "0",
+        "length": "10",
+        "order": [{"column": "1", "dir": "desc"}],
+    }
+
+
+def test_serve_answers_datatables_requests(df):
+    with serve(df, allow_origin="null") as server:
+        assert server.url.startswith("http://127.0.0.1:")
+        with urlopen(
+            server.url + "?" + _query_string(**{"search[value]": "o", "start": 1})
+        ) as response:
+            assert response.headers["Access-Control-Allow-Origin"] == "null"
+            data = json.loads(response.read())
+
+    assert data == {
+        "draw": 1,
+        "recordsTotal": 3,
+        "recordsFiltered": 2,
+        "data": [[["2.0", 2.0], "Rome"]],
+    }
+
+
+def test_serve_does_not_allow_other_origins_by_default(df):
+    with serve(df) as server:
+        with urlopen(server.url + "?" + _query_string()) as response:
+            assert "Access-Control-Allow-Origin" not in response.headers
+
+
+def test_serve_reports_errors(df):
+    with serve(df) as server:
+        query_string = _query_string(**{"order[0][column]": 5})
+        with urlopen(server.url + "?" + query_string) as response:
+            data = json.loads(response.read())
+
+    assert data["draw"] == 1
+    assert "error" in data and "data" not in data
+
+
+def test_html_table_requests_its_rows_from_the_server(df):
+    with serve(df) as server:
+        html = server.to_html_datatable(caption="cities")
+
+    assert "data_json" not in html
+    assert f'"server_side_url": "{server.url}"' in html
+    assert "<th>Paris</th>" not in html
+
+
+def test_non_finite_floats_are_escaped_like_in_data_json():
+    df = pd.DataFrame({"x": [float("nan"), float("inf"), 1.5]})
+    with serve(df, format_floats_in_python=False) as server:
+        html = server.to_html_datatable()
+        with urlopen(server.url + "?" + _query_string()) as response:
+            data = json.loads(response.read())
+
+    # The response is parsed by the ITable class with parseJSON
+    assert f'"server_side_url": "{server.url}"' in html
+    assert data["data"] == [["___NaN___"], ["___Infinity___"], [1.5]]
@@ -0,0 +1,229 @@
+import json
+
+import pytest
+
+from itables.javascript import get_itables_extension_arguments
+
+
+def _server_side_table(df_and_engine, **kwargs):
+    df, engine = df_and_engine
+    dt_args, other_args = get_itables_extension_arguments(
+        df, server_side=True, server_side_engine=engine, **kwargs
+    )
+    assert "data_json" not in dt_args
+    return other_args["server_side_table"]
+
+
+def _request(start=0, length=-1, search="", order=(), column_count=2):
+    return {
+        "draw": 1,
+        "start": start,
+        "length": length,
+        "search": {"value": search},
+        "order": [{"column": column, "dir": dir} for column, dir in order],
+        "columns": [
+            {"searchable": True, "search": {"value": ""}} for _ in range(column_count)
+        ],
+    }
+
+
+@pytest.fixture(
+    params=[
+        ("pandas", "dataframe"),
+        ("polars", "dataframe"),
+        ("polars_lazy", "dataframe"),
+        ("pandas", "duckdb"),
+        ("polars", "duckdb"),
+        ("polars_lazy", "duckdb"),
+        ("pyarrow", "duckdb"),
+    ],
+    ids=lambda p: "-".join(p),
+)
+def df_and_engine(request):
+    module_name, engine = request.param
+    module = pytest.importorskip(module_name.removesuffix("_lazy"))
+    if engine == "duckdb":
+        pytest.importorskip("duckdb")
+    data = {"x": [3, 1, 4, 1, 5], "s": ["Paris", "London", "Berlin", "Rome", "Lisbon"]}
+    if module_name == "pyarrow":
+        return module.table(data), engine
+    if module_name == "polars_lazy":
+        return module.LazyFrame(data), engine
+    return module.DataFrame(data), engine
+
+
+def test_server_side_table_is_not_downsampled(df_and_engine):
+    table = _server_side_table(df_and_engine, maxRows=2)
+    response = table.get_page(_request())
+    assert response["recordsTotal"] == response["recordsFiltered"] == 5
+    assert json.loads(response["data_json"]) == [
+        [3, "Paris"],
+        [1, "London"],
+        [4, "Berlin"],
+        [1, "Rome"],
+        [5, "Lisbon"],
+    ]
+
+
+def test_server_side_table_returns_the_requested_page(df_and_engine):
+    table = _server_side_table(df_and_engine)
+    response = table.get_page(_request(start=2, length=2))
+    assert response["draw"] == 1
+    assert response["recordsFiltered"] == 5
+    assert json.loads(response["data_json"]) == [[4, "Berlin"], [1, "Rome"]]
+
+
+def test_server_side_table_sorts_the_full_table(df_and_engine):
+    table = _server_side_table(df_and_engine)
+    response = table.get_page(_request(length=3, order=[(0, "desc"), (1, "asc")]))
+    assert json.loads(response["data_json"]) == [
+        [5, "Lisbon"],
+        [4, "Berlin"],
+        [3, "Paris"],
+    ]
+    response = table.get_page(_request(start=3, order=[(0, "desc"), (1, "asc")]))
+    assert json.loads(response["data_json"]) == [[1, "London"], [1, "Rome"]]
+
+
+def test_server_side_table_search_is_case_insensitive(df_and_engine):
+    table = _server_side_table(df_and_engine)
+    response = table.get_page(_request(search="ON"))
+    assert response["recordsTotal"] == 5
+    assert response["recordsFiltered"] == 2
+    assert json.loads(response["data_json"]) == [[1, "London"], [5, "Lisbon"]]
+
+    # every word of the search must match
+    response = table.get_page(_request(search="on 5"))
+    assert json.loads(response["data_json"]) == [[5, "Lisbon"]]
+
+
+def test_server_side_table_column_search(df_and_engine):
+    table = _server_side_table(df_and_engine)
+    request = _request()
+    request["columns"][1]["search"]["value"] = "r"
+    response = table.get_page(request)
+    assert json.loads(response["data_json"]) == [
+        [3, "Paris"],
+        [4, "Berlin"],
+        [1, "Rome"],
+    ]
+
+
+def test_server_side_table_with_index():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"x": [2.5, 1.0]}, index=pd.Index(["a", "b"], name="key"))
+    dt_args, other_args = get_itables_extension_arguments(df, server_side=True)
+    assert dt_args["columnDefs"][0]["targets"] == [1]
+    table = other_args["server_side_table"]
+    response = table.get_page(_request(order=[(1, "asc")]))
+    assert json.loads(response["data_json"]) == [
+        ["b", ["1.0", 1.0]],
+        ["a", ["2.5", 2.5]],
+    ]
+
+
+def test_server_side_table_reports_errors(df_and_engine):
+    table = _server_side_table(df_and_engine)
+    response = table.get_page(_request(order=[(7, "asc")]))
+    assert response["draw"] == 1
+    assert "error" in response and "data_json" not in response
+
+
+def test_server_side_is_not_available_with_selected_rows(df_and_engine):
+    with pytest.raises(ValueError, match="Row selection"):
+        _server_side_table(df_and_engine, selected_rows=[0])
+
+
+def test_polars_lazy_engine_collects_only_the_requested_page():
+    pl = pytest.importorskip("polars")
+    evaluated = []
+
+    def opposite(x):
+        evaluated.append(x)
+        return -x
+
+    lf = pl.LazyFrame({"x": range(100_000)}).with_columns(
+        y=pl.col("x").map_elements(opposite, return_dtype=pl.Int64)
+    )
+    table = _server_side_table((lf, "dataframe"))
+    assert type(table.engine).__name__ == "PolarsLazyQueryEngine"
+    response = table.get_page(_request(start=50_000, length=2))
+    assert response["recordsTotal"] == response["recordsFiltered"] == 100_000
+    assert json.loads(response["data_json"]) == [[50_000, -50_000], [50_001, -50_001]]
+    assert len(evaluated) < 1000
+
+
+def test_the_rows_of_a_lazyframe_are_counted_once(monkeypatch):
+    pl = pytest.importorskip("polars")
+    import itables.downsample
+    import itables.javascript
+    from itables.server_side import PolarsLazyQueryEngine
+
+    counts = []
+
+    def count(lf):
+        counts.append(lf)
+        return lf.select(pl.len()).collect().item()
+
+    def shape(lf):
+        return count(lf), len(lf.collect_schema())
+
+    monkeypatch.setattr(PolarsLazyQueryEngine, "_count", staticmethod(count))
+    monkeypatch.setattr(itables.javascript, "polars_lazyframe_shape", shape)
+    monkeypatch.setattr(itables.downsample, "polars_lazyframe_shape", shape)
+
+    table = _server_side_table((pl.LazyFrame({"x": range(100)}), "dataframe"))
+    table.get_page(_request(length=10, column_count=1))
+    assert len(counts) == 1
+
+
+@pytest.mark.parametrize("module_name", ["pandas", "polars"])
+def test_search_index_gives_the_same_rows_as_the_column_search(module_name):
+    module = pytest.importorskip(module_name)
+    df = module.DataFrame(
+        {
+            "x": [1.5, None, 3.25, 10.0],
+            "s": ["Paris", None, "Lisbon", "Rome"],
+            "b": [True, False, None, True],
+            "empty": ["", "", "", ""],
+        }
+    )
+    table = _server_side_table((df, "dataframe"))
+    # The search index is not used when a column is not searchable
+    request_without_index = _request(column_count=4)
+    request_without_index["columns"][3]["searchable"] = False
+    for search in ["1", "r", "true", "none", "nan", "is 1", "e\nr"]:
+        request_without_index["search"]["value"] = search
+        without_index = table.get_page(request_without_index)
+        assert table.engine.search_index is None
+        with_index = table.get_page(_request(search=search, column_count=4))
+        assert table.engine.search_index is not None
+        assert with_index == without_index, search
+        table.engine.search_index = None
+
+
+@pytest.mark.parametrize("engine", ["dataframe", "duckdb"])
+def test_pages_of_a_sort_with_ties_cover_every_row(engine):
+    pd = pytest.importorskip("pandas")
+    if engine == "duckdb":
+        pytest.importorskip("duckdb")
+    df = pd.DataFrame({"b": [i % 3 == 0 for i in range(30_000)], "i": range(30_000)})
+    table = _server_side_table((df, engine))
+    rows = []
+    for start in range(0, len(df), 7_000):
+        request = _request(start=start, length=7_000, order=[(0, "desc")])
+        rows.extend(json.loads(table.get_page(request)["data_json"]))
+
+    # The rows that are equal on the sort column come in the DataFrame order
+    expected = df.sort_values("b", ascending=False, kind="stable")
+    assert rows == expected.values.tolist()
+
+
+def test_query_engines_must_implement_query():
+    from itables.server_side import QueryEngine
+
+    class EngineWithoutQuery(QueryEngine):
+        pass
+
+    with pytest.raises(TypeError, match="query"):
+        EngineWithoutQuery(None)
@@ -1,9 +1,11 @@
+import io
 from pathlib import Path
 from unittest.mock import patch
 
 import pytest
 
-from itables import to_html_datatable
+from itables import to_html_datatable, write_html_datatable
+from itables.datatables_format import iter_encoded_columns
 
 try:
     from itables.sample_pandas_dfs import (
@@ -43,8 +45,13 @@ def test_to_html_datatable(df_name, df):
             "https://www.unpkg.com/dt_for_itables@{dt_for_itables_version}/dt_bundle.js",
         ),
     ):
+        # The reference files are encoded with the json module
         html = to_html_datatable(
-            df, table_id="table_id", display_logo_when_loading=False, connected=True
+            df,
+            table_id="table_id",
+            display_logo_when_loading=False,
+            connected=True,
+            json_encoder="stdlib",
         )
 
     if not ref_html_file.exists():
@@ -75,3 +82,24 @@ def test_static_preview_fallback_includes_the_trust_hint(df):
         "🔒</span>"
         "</noscript>"
     ) in thead
+
+
+@pytest.mark.parametrize("data_json_orient", ["rows", "columns"])
+def test_write_html_datatable(df, data_json_orient):
+    html = io.StringIO()
+    with patch.dict(iter_encoded_columns.__kwdefaults__, {"chunk_rows": 2}):
+        write_html_datatable(
+            df, html, table_id="table_id", data_json_orient=data_json_orient
+        )
+    assert html.getvalue() == to_html_datatable(
+        df, table_id="table_id", data_json_orient=data_json_orient
+    )
+
+
+def test_write_html_datatable_with_compressed_data(df):
+    html = io.StringIO()
+    with patch.dict(iter_encoded_columns.__kwdefaults__, {"chunk_rows": 2}):
+        write_html_datatable(df, html, table_id="table_id", compress_data=True)
+    assert html.getvalue() == to_html_datatable(
+        df, table_id="table_id", compress_data=True
+    )
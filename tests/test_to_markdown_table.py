@@ -161,3 +161,25 @@ def test_styler_falls_back_to_its_underlying_data():
     assert "no static preview" not in markdown
     assert _cells(markdown.splitlines()[2]) == ["1"]
     assert to_markdown_table(styler, allow_html=True) == markdown
+
+
+def test_data_json_orient_columns_gives_the_same_table(df_name, df):
+    assert to_markdown_table(df, data_json_orient="columns") == to_markdown_table(df)
+
+
+def test_dictionary_encoding_gives_the_same_table(df_name, df):
+    assert to_markdown_table(df, dictionary_encoding=True) == to_markdown_table(
+        df, dictionary_encoding=False
+    )
+
+
+def test_compact_floats_gives_the_same_table(df_name, df):
+    assert to_markdown_table(df, compact_floats=True) == to_markdown_table(df)
+
+
+def test_compressed_data_gives_the_same_table(df_name, df):
+    assert to_markdown_table(df, compress_data=True) == to_markdown_table(df)
+
+
+def test_epoch_datetime_encoding_gives_the_same_table(df_name, df):
+    assert to_markdown_table(df, datetime_encoding="epoch") == to_markdown_table(df)
@@ -1,4 +1,6 @@
+import base64
 import itertools
+import json
 
 import pytest
 
@@ -56,6 +58,36 @@ def test_create_widget_with_df(df, df_name):
     }
 
 
+@pytest.mark.parametrize("compress_data", [False, True])
+def test_widget_data_is_sent_as_bytes(df, compress_data):
+    from itables.javascript import get_itable_arguments
+    from itables.widget import ITable
+
+    itable = ITable(df, compress_data=compress_data)
+    assert "data_json" not in itable._dt_args
+    assert isinstance(itable._data_json, bytes)
+
+    data_json = get_itable_arguments(df, compress_data=compress_data)["data_json"]
+    if compress_data:
+        assert itable._dt_args["data_json_compression"] == "gzip"
+        assert itable._data_json == base64.b64decode(data_json)
+    else:
+        assert itable._data_json == data_json.encode("utf-8")
+
+
+def test_update_sends_the_new_data_as_bytes():
+    pd = pytest.importorskip("pandas")
+    from itables.widget import ITable
+
+    itable = ITable(pd.DataFrame({"x": [1, 2]}))
+    itable.update(pd.DataFrame({"x": [3]}))
+    assert itable._data_json == b"[[3]]"
+
+    # Updating only the DataTable arguments does not change the data
+    itable.update(paging=False)
+    assert itable._data_json == b"[[3]]"
+
+
 def test_update_clears_stale_column_defs():
     """Updating a widget to a dataframe with a different column structure
     should not leave stale auto-generated columnDefs or keys_to_be_evaluated
@@ -123,3 +155,66 @@ def test_update_equivalent_to_create(df1_name, df2_name):
     table_direct = ITable(df2)
 
     assert table_updated._dt_args == table_direct._dt_args
+
+
+def test_server_side_widget_answers_page_requests():
+    pd = pytest.importorskip("pandas")
+    from itables.widget import ITable
+
+    itable = ITable(pd.DataFrame({"x": range(100)}), server_side=True, maxRows=10)
+    assert itable._server_side
+    assert itable._data_json == b""
+    assert "downsampling_warning" not in itable._dt_args
+
+    messages = []
+    itable.send = messages.append
+    itable._handle_custom_msg(
+        itable,
+        {
+            "type": "server_side_request",
+            "id": 3,
+            "request": {"draw": 2, "start": 95, "length": 10},
+        },
+        [],
+    )
+    (response,) = messages
+    assert json.loads(response.pop("data_json")) == [[95], [96], [97], [98], [99]]
+    assert response == {
+        "type": "server_side_response",
+        "id": 3,
+        "draw": 2,
+        "recordsTotal": 100,
+        "recordsFiltered": 100,
+    }
+
+    itable.update(pd.DataFrame({"x": [1, 2]}))
+    assert itable._data_json == b""
+    assert messages[-1] == {"type": "server_side_reload"}
+    assert len(itable._server_side_table) == 2
+
+
+def test_server_side_search_index_is_kept_until_the_df_changes():
+    pd = pytest.importorskip("pandas")
+    from itables.widget import ITable
+
+    df = pd.DataFrame({"x": [1, 2, 3], "s": ["a", "b", "c"]})
+    itable = ITable(df, server_side=True)
+    itable.send = lambda msg: None
+    assert itable._server_side_table.engine.search_index is None
+
+    request = {"draw": 1, "search": {"value": "b"}}
+    response = itable._server_side_table.get_page(request)
+    assert response["recordsFiltered"] == 1
+    search_index = itable._server_side_table.engine.search_index
+    assert search_index is not None
+
+    # The search index is kept when only the options change
+    itable.update(paging=False)
+    assert itable._server_side_table.engine.search_index is search_index
+
+    # and dropped when the table is passed again, as it might have changed
+    df.loc[0, "s"] = "b"
+    itable.update(df)
+    assert itable._server_side_table.engine.search_index is None
+    response = itable._server_side_table.get_page(request)
+    assert response["recordsFiltered"] == 2